@@ -3,10 +3,9 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import hashlib
-import matplotlib as matplotlib
-import matplotlib.pyplot as plt
 import os
-from functionsapp import plot_zone_chart, calc_zone_stats, styled_text, split_name, centered_metric
+from functionsapp import plot_zone_chart, plot_zone_chart_svg, plot_density_chart, shot_bin_cube, density_chart_key, zone_chart_stats, zone_chart_key, figure_bytes, shot_category_summary, styled_text, split_name, centered_metric, table_html, benchmark_colors
+from dataapp import DATA_SOURCES, DEFAULT_TTL, DEFAULT_HUSTLE_WEIGHTS, HUSTLE_COLUMNS, BOX_COLUMNS, BOX_KEYS, PRESS_COLUMNS, PRESS_SCORE_WEIGHTS, load_sources, local_source, build_index, select_rows, count_matrix, group_mask, sum_by, weighted_scores, box_metrics, efficiency_cube, efficiency_metrics, ViewCache
 # -----------------------------
 # Page Config
 # --------------------------
@@ -81,24 +80,129 @@ st.sidebar.button("Logout", on_click=do_logout)
 # Load Data
 # -----------------------------
 # Direct CSV URL
-@st.cache_data
-def load_data():
-    csv_url = st.secrets["data"]["shooting_url"]
-    csv_url_hustle = st.secrets["data"]["hustle_url"]
-    practice_url = st.secrets["data"]["practice_url"]
-    game_url = st.secrets["data"]["game_url"]
-    press_url = st.secrets["data"]["press_url"]
+# Sheets are revalidated (conditional GET) at most every DATA_TTL seconds;
+# set `refresh_ttl` under [data] in secrets to change it
+DATA_TTL = int(st.secrets.get("data", {}).get("refresh_ttl", DEFAULT_TTL))
+# Set `local_dir` under [data] in secrets (or JP_DATA_DIR) to read <dataset>.csv/.parquet
+# files from a folder instead of the live sheets, e.g. one made by fixturesapp.py
+DATA_DIR = os.environ.get("JP_DATA_DIR") or st.secrets.get("data", {}).get("local_dir")
+
+@st.cache_data(ttl=DATA_TTL)
+def load_data(names):
+    """Load the named DATA_SOURCES datasets in one batch; returns ({name: DataFrame}, {name: version})."""
+    if DATA_DIR:
+        urls = {name: local_source(DATA_DIR, name) for name in names}
+    else:
+        urls = {name: st.secrets["data"][DATA_SOURCES[name]] for name in names}
+
+    # Every distinct sheet is downloaded once, in parallel; only changed sheets are re-parsed
+    frames, timings = load_sources(urls, ttl=DATA_TTL)
+    return frames, {name: timing["version"] for name, timing in timings.items()}
+
+@st.cache_resource(max_entries=16)
+def selection_index(name, version, _frame):
+    """Row positions per value of each categorical column, built once per data version."""
+    return build_index(_frame)
+
+@st.cache_resource
+def view_cache():
+    """Filtered views shared by every session; see ViewCache.stats() for hit/miss counts."""
+    return ViewCache()
+
+# Shot chart format and resolution (set `mode`/`size`/`dpi` under [charts] in secrets):
+# "svg" sends a few KB of vectors the browser scales itself, "png" a rendered image of size x dpi
+CHART_MODE = st.secrets.get("charts", {}).get("mode", "svg")
+CHART_SIZE = float(st.secrets.get("charts", {}).get("size", 18))
+CHART_DPI = int(st.secrets.get("charts", {}).get("dpi", 200))
+CHART_CACHE_BYTES = 256 * 1024 * 1024
+
+@st.cache_resource(max_entries=4)
+def shot_bins(version, _df):
+    """Court-bin counts per player/week/TYPE/game, built once per shot log version."""
+    return shot_bin_cube(_df)
+
+# Hustle Score weights (override any column under [hustle] weights in secrets, e.g. Charges = 3)
+HUSTLE_WEIGHTS = {**DEFAULT_HUSTLE_WEIGHTS, **{
+    col: float(weight) for col, weight in st.secrets.get("hustle", {}).get("weights", {}).items()
+    if col in HUSTLE_COLUMNS}}
+
+@st.cache_resource(max_entries=4)
+def hustle_counts(version, _frame):
+    """Hustle totals per player/week/session, aggregated once per hustle sheet version."""
+    return count_matrix(_frame, ["Player", "Week", "Game/Practice"], HUSTLE_COLUMNS)
+
+@st.cache_resource(max_entries=8)
+def box_cube(name, version, _frame):
+    """Ast/TO/rebound totals per player/week/game/TYPE cell of one sheet, aggregated once per version."""
+    return count_matrix(_frame, [col for col in BOX_KEYS if col in _frame.columns], BOX_COLUMNS)
+
+@st.cache_resource(max_entries=32)
+def box_dashboard(name, version, _frame, criteria):
+    """Dashboard metrics of every player and the team for one selection (see box_metrics), once per version."""
+    groups, counts = box_cube(name, version, _frame)
+    return box_metrics(groups, counts, group_mask(groups, criteria))
+
+def box_totals(metrics, player):
+    """Assists, turnovers, OFF/DEF rebounds and AST/TO ratio of one box_dashboard row (all 0 if absent)."""
+    player = "Team" if player is None else player
+    if player not in metrics.index:
+        return 0, 0, 0, 0, 0
+    assists, turnovers = metrics.at[player, "Ast"], metrics.at[player, "TO"]
+    ast_to_ratio = metrics.at[player, "AST/TO"] if turnovers != 0 else assists
+    return assists, turnovers, metrics.at[player, "OFF_Reb"], metrics.at[player, "DEF_Reb"], ast_to_ratio
+
+@st.cache_resource(max_entries=4)
+def efficiency_counts(version, _log):
+    """Possession totals per player on the floor/week/game (see efficiency_cube), built once per log version."""
+    return efficiency_cube(_log)
+
+@st.cache_resource(max_entries=32)
+def efficiency_dashboard(version, _log, criteria):
+    """Ratings and shooting % of every player and the team for one selection; criteria None = no possessions."""
+    groups, counts = efficiency_counts(version, _log)
+    if criteria is None or any(value is not None and col not in groups.columns for col, value in criteria.items()):
+        return efficiency_metrics(groups, counts, np.zeros(len(groups), dtype=bool))
+    return efficiency_metrics(groups, counts, group_mask(groups, criteria))
+
+def has_source(name):
+    """Whether an optional dataset (e.g. the possession log) is configured for this deployment."""
+    if DATA_DIR:
+        return os.path.exists(local_source(DATA_DIR, name))
+    return DATA_SOURCES[name] in st.secrets.get("data", {})
+
+def metric_value(metrics, player, col):
+    """One efficiency metric of `player` ("Team" for None); NaN when the player has no possessions."""
+    player = "Team" if player is None else player
+    return metrics.at[player, col] if metrics is not None and player in metrics.index else np.nan
+
+def metric_text(value, percent=False):
+    """A metric rounded for display, or "N/A" when undefined."""
+    return "N/A" if pd.isna(value) else f"{value:.1f}{'%' if percent else ''}"
+
+@st.cache_resource(max_entries=4)
+def press_counts(version, _frame):
+    """Press outcome totals per press/game/week, aggregated once per press sheet version."""
+    return count_matrix(_frame, ["Press", "Game", "Week"], PRESS_COLUMNS)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def render_table(frame, colors=None, total_row=True, title=None, percent_cols=()):
+    """Table HTML per distinct content (see table_html), shared by every session."""
+    return table_html(frame, colors, total_row, title, percent_cols=percent_cols)
+
+@st.cache_resource
+def chart_cache():
+    """Rendered shot chart images keyed by content hash, bounded by total bytes."""
+    return ViewCache(maxsize=CHART_CACHE_BYTES, weigh=len)
+
+# The sidebar needs the shot log and hustle weeks; the game, practice, press and
+# pickup sheets are loaded by the tabs that show them
+data, versions = load_data(("shooting", "hustle"))
 
 # Set DF Variable
-    df = pd.read_csv(csv_url)
-    df_hustle = pd.read_csv(csv_url_hustle)
-    stats_df = pd.read_csv(practice_url)
-    game_df = pd.read_csv(game_url)
-    practice_df = pd.read_csv(practice_url)
-    press_df = pd.read_csv(press_url)
-    return df, df_hustle, stats_df, game_df, practice_df, press_df
+df = data["shooting"]
+df_hustle = data["hustle"]
 
-df, df_hustle, stats_df, game_df, practice_df, press_df = load_data()
+shot_index = selection_index("shooting", versions["shooting"], df)
 
 # Sidebar filters
 st.sidebar.header("Shot/Player Filters")
@@ -110,8 +214,7 @@ players = ["Team"] + players  # Add "Team" option at top
 selected_player = st.sidebar.selectbox("Select Player", players)
 
 # --- Week Filter (TRUMPS ALL) ---
-weeks_shot = df["WEEK"].dropna().unique().tolist()
-weeks_shot.sort()
+weeks_shot = df["WEEK"].cat.categories.tolist()  # week labels, already in natural order
 weeks_shot = ["Season"] + weeks_shot
 selected_week_shot = st.sidebar.selectbox("Select Week", weeks_shot)
 
@@ -143,7 +246,7 @@ else:
 #     if "Week" in stats_df.columns:
 #         week_values = stats_df["Week"].astype(str).unique().tolist()
 #         if str(selected_week_shot) in week_values:
-#             stats_df = stats_df[stats_df["Week"].astype(str) == str(selected_week_shot)]
+#             stats_df = stats_df[stats_df["Week"] == selected_week_shot]
 #         else:
 #             stats_df = stats_df.iloc[0:0]  # Empty DF if week not found
 #     else:
@@ -152,7 +255,7 @@ else:
 #     if "Week" in game_df.columns:
 #         week_values_game = game_df["Week"].astype(str).unique().tolist()
 #         if str(selected_week_shot) in week_values_game:
-#             game_df = game_df[game_df["Week"].astype(str) == str(selected_week_shot)]
+#             game_df = game_df[game_df["Week"] == selected_week_shot]
 #         else:
 #             game_df = game_df.iloc[0:0]  # Empty DF if week not found
 #     else:
@@ -175,102 +278,61 @@ else:
 #     stats_df = stats_df.copy() 
 
 # ----------------------------------------------------------
-# Start with full DataFrames
-# ----------------------------------------------------------
-filtered = df.copy()
-stats_filtered = stats_df.copy()
-game_filtered = game_df.copy()
-
-# ----------------------------------------------------------
-# 1. Apply GAME TYPE filter first ("Game" or "Practice")
+# Resolve the selection through the prebuilt indexes
 # ----------------------------------------------------------
-if game_types:  # list of allowed types
-    filtered = filtered[filtered["TYPE"].isin(game_types)]
-    stats_filtered = stats_filtered[stats_filtered["TYPE"].isin(game_types)] \
-        if "TYPE" in stats_filtered.columns else stats_filtered
-    game_filtered = game_filtered[game_filtered["TYPE"].isin(game_types)] \
-        if "TYPE" in game_filtered.columns else game_filtered
+# None = no filter. Sheets without a TYPE column are not filtered by type;
+# sheets missing the week/game column come back empty for that selection.
+week_filter = None if selected_week_shot == "Season" else selected_week_shot
+game_filter = None if selected_game == "Season" else selected_game
+player_filter = None if selected_player == "Team" else selected_player
 
-# ----------------------------------------------------------
-# 2. Apply WEEK filter
-# ----------------------------------------------------------
-if selected_week_shot != "Season":
+def compute_view():
+    filtered = select_rows(df, shot_index, {
+        "TYPE": game_types, "WEEK": week_filter, "GAME": game_filter, "PLAYER": player_filter})
+    shot_summary = shot_category_summary(filtered)
+    return filtered, shot_summary
 
-    filtered = filtered[filtered["WEEK"] == selected_week_shot] \
-        if "WEEK" in filtered.columns else filtered.iloc[0:0]
+# Popular selections (Team/Season, each starter, the latest game) are computed once for all sessions
+view_key = (versions["shooting"], selected_player, selected_week_shot, selected_type, selected_game)
+filtered, shot_summary = view_cache().get(view_key, compute_view)
 
-    stats_filtered = stats_filtered[
-        stats_filtered["Week"].astype(str) == str(selected_week_shot)
-    ] if "Week" in stats_filtered.columns else stats_filtered.iloc[0:0]
-
-    game_filtered = game_filtered[
-        game_filtered["Week"].astype(str) == str(selected_week_shot)
-    ] if "Week" in game_filtered.columns else game_filtered.iloc[0:0]
 
 # ----------------------------------------------------------
-# 3. Apply GAME filter (Specific game like "Game 3")
+# Final Output DataFrames
 # ----------------------------------------------------------
-if selected_game != "Season":
-
-    filtered = filtered[filtered["GAME"] == selected_game] \
-        if "GAME" in filtered.columns else filtered.iloc[0:0]
+filtered_df = filtered
 
-    stats_filtered = stats_filtered[
-        stats_filtered["GAME"] == selected_game
-    ] if "GAME" in stats_filtered.columns else stats_filtered.iloc[0:0]
 
-    game_filtered = game_filtered[
-        game_filtered["GAME"] == selected_game
-    ] if "GAME" in game_filtered.columns else game_filtered.iloc[0:0]
+def load_sheet(name):
+    """Load one box score or press sheet with its data version."""
+    frames, sheet_versions = load_data((name,))
+    return frames[name], sheet_versions[name]
 
-# ----------------------------------------------------------
-# 4. Apply PLAYER filter
-# ----------------------------------------------------------
-if selected_player != "Team":
 
-    filtered = filtered[filtered["PLAYER"] == selected_player] \
-        if "PLAYER" in filtered.columns else filtered.iloc[0:0]
+def sheet_selection(name):
+    """Load one box score sheet with its data version and the type/week/game criteria of the selection above."""
+    frame, version = load_sheet(name)
+    criteria = {"TYPE": game_types if "TYPE" in frame.columns else None, "Week": week_filter, "GAME": game_filter}
+    return frame, version, criteria
 
 
-# ----------------------------------------------------------
-# Final Output DataFrames
-# ----------------------------------------------------------
-filtered_df = filtered
-stats_df = stats_filtered
-game_df = game_filtered
-
 st.sidebar.header("Lunch Pail Week Filter")
-weeks = df_hustle["Week"].dropna().unique().tolist()
-weeks.sort()
+weeks = df_hustle["Week"].cat.categories.tolist()
 weeks = ["Season"] + weeks
-selected_week = st.sidebar.selectbox("Select Week", weeks)
-
-# --- Filtering Logic ---
-if selected_week == "Season":
-    if selected_game != "Season":
-        df_hustle = df_hustle[
-            (df_hustle["Game/Practice"] == str(selected_game))]
-    else:
-        df_hustle = df_hustle
+selected_week = st.sidebar.selectbox("Select Week", weeks, key="lunch_pail_week")
 
-else:
-    if selected_game != "Season":
-        df_hustle = df_hustle[
-            (df_hustle["Game/Practice"] == str(selected_game))
-            & (df_hustle["Week"] == selected_week)]
-    else:
-        df_hustle = df_hustle[
-            (df_hustle["Week"] == selected_week)]
         
-# Create Tabs
-tab1, tab7, tab6, tab8, tab3, tab2, tab4, tab5 = st.tabs(["Shot Chart", "Team Practice Stats", "Team Game Stats", "Press Effectiveness", "Lunch Pail Stats", "Player Game Dashboard", "Player Practice Dashboard", "Pickup Dashboard"])
+# Views (only the selected one is computed and rendered on each rerun;
+# set_active_tab switches views from a callback)
+views = ["Shot Chart", "Team Practice Stats", "Team Game Stats", "Press Effectiveness", "Lunch Pail Stats", "Player Game Dashboard", "Player Practice Dashboard", "Pickup Dashboard"]
+active_tab = st.radio("View", views, horizontal=True, key="active_tab", label_visibility="collapsed")
 
 st.markdown(
     """
     <style>
     @media print {
-        /* Hide the tab buttons/headers only */
-        .stTabs [role="tablist"] {
+        /* Hide the view selector only */
+        .st-key-active_tab {
             display: none !important;
         }
     }
@@ -282,7 +344,7 @@ st.markdown(
 # -----------------------------
 # Tab 1: Original Shot Chart
 # -----------------------------
-with tab1:
+if active_tab == "Shot Chart":
     # Left + Right columns for image and stats
         left_col, right_col = st.columns([1, 2])
 
@@ -306,26 +368,46 @@ with tab1:
             col1, col2, col3 = st.columns(3)
             # Layup, Midrange, 3PT metrics
                 # --- Layup ---
-            makesL, attL, pctL = calc_zone_stats(filtered, "Layup")
+            makesL, attL, pctL = shot_summary["Layup"]
             col1.markdown(styled_text("Layup", size=22, margin="0px 0px 0px 0px", underline=True, center=True), unsafe_allow_html=True)
             col1.markdown(styled_text(f"{makesL}/{attL}", size=18, weight="normal", margin="0px 0px 16px 0px",underline=False, center=True), unsafe_allow_html=True)
             col1.markdown(styled_text(f"{pctL:.1f}%", size=18, weight="normal", margin="-10px",underline=False, center=True), unsafe_allow_html=True)
 
             # --- Midrange ---
-            makesM, attM, pctM = calc_zone_stats(filtered, "Midrange")
+            makesM, attM, pctM = shot_summary["Midrange"]
             col2.markdown(styled_text("Midrange", size=22, margin="0px 0px 0px 0px", underline=True, center=True), unsafe_allow_html=True)
             col2.markdown(styled_text(f"{makesM}/{attM}", size=18, weight="normal", margin="0px 0px 16px 0px",underline=False, center=True), unsafe_allow_html=True)
             col2.markdown(styled_text(f"{pctM:.1f}%", size=18, weight="normal", margin="-10px",underline=False, center=True), unsafe_allow_html=True)
 
             # --- 3PT ---
-            makes3, att3, pct3 = calc_zone_stats(filtered, "3PT")
+            makes3, att3, pct3 = shot_summary["3PT"]
             col3.markdown(styled_text("3PT", size=22, margin="0px 0px 0px 0px", underline=True, center=True), unsafe_allow_html=True)
             col3.markdown(styled_text(f"{makes3}/{att3}", size=18, weight="normal", margin="0px 0px 16px 0px",underline=False, center=True), unsafe_allow_html=True)
             col3.markdown(styled_text(f"{pct3:.1f}%", size=18, weight="normal", margin="-10px",underline=False, center=True), unsafe_allow_html=True)
 
-        # Shot chart
-        fig = plot_zone_chart(filtered, df)
-        st.pyplot(fig, use_container_width=True)
+        # Shot chart (identical numbers + settings reuse the rendered image)
+        chart_view = st.radio("Chart", ["Zones", "Frequency", "FG%"], horizontal=True, key="shot_chart_view")
+        if chart_view != "Zones":
+            # Density: the selection's grid is the sum of its cached per-game grids
+            smooth = st.checkbox("Smooth", value=True, key="shot_chart_smooth")
+            groups, attempts, makes = shot_bins(versions["shooting"], df)
+            mask = group_mask(groups, {"TYPE": game_types, "WEEK": week_filter, "GAME": game_filter, "PLAYER": player_filter})
+            attempts, makes = attempts[mask].sum(axis=0), makes[mask].sum(axis=0)
+            surface = "fg" if chart_view == "FG%" else "frequency"
+            sigma = 1.0 if smooth else 0
+            chart_key = density_chart_key(attempts, makes, surface=surface, sigma=sigma, size=CHART_SIZE, dpi=CHART_DPI)
+            chart = chart_cache().get(chart_key, lambda: figure_bytes(
+                plot_density_chart(attempts, makes, surface, sigma=sigma, size=CHART_SIZE, dpi=CHART_DPI), dpi=CHART_DPI))
+        else:
+            zone_stats = zone_chart_stats(filtered)
+            if CHART_MODE == "svg":
+                chart_key = zone_chart_key(zone_stats, mode="svg")
+                chart = chart_cache().get(chart_key, lambda: plot_zone_chart_svg(zone_stats))
+            else:
+                chart_key = zone_chart_key(zone_stats, size=CHART_SIZE, dpi=CHART_DPI)
+                chart = chart_cache().get(chart_key, lambda: figure_bytes(
+                    plot_zone_chart(filtered, size=CHART_SIZE, dpi=CHART_DPI, zone_stats=zone_stats), dpi=CHART_DPI))
+        st.image(chart, use_container_width=True)
 
 player_info = {
     "Asher Reynolds": {"number": 4, "position": "Guard"},
@@ -358,77 +440,28 @@ player_info = {
 selected_player_info = (lambda x: f"#{player_info[x]['number']} — {player_info[x]['position']}" 
                         if x in player_info else x)(selected_player)
 
-if selected_game != "Season":
-    game_df = game_df[game_df["GAME"] == str(selected_game)]
-
-    if game_df.empty:
-        game_total_assists = 0
-        game_total_turnovers = 0
-        game_total_off_rebs = 0
-        game_total_def_rebs = 0
-        game_ast_to_ratio = 0
-
-    else:
-        game_total_assists = game_df["Ast"].sum()
-        game_total_turnovers = game_df["TO"].sum()
-        game_total_off_rebs = game_df["OFF_Reb"].sum()
-        game_total_def_rebs = game_df["DEF_Reb"].sum()
-        game_ast_to_ratio = (
-            round(game_total_assists / game_total_turnovers, 2)
-            if game_total_turnovers != 0
-            else game_total_assists
-        )
-
-    if selected_player != "Team":
-        player_df = game_df[game_df["Player"] == selected_player]
-
-        if player_df.empty:
-            game_total_assists = 0
-            game_total_turnovers = 0
-            game_total_off_rebs = 0
-            game_total_def_rebs = 0
-            game_ast_to_ratio = 0
-        else:
-            # Sum the stats for that player
-            game_total_assists = player_df["Ast"].sum()
-            game_total_turnovers = player_df["TO"].sum()
-            game_total_off_rebs = player_df["OFF_Reb"].sum()
-            game_total_def_rebs = player_df["DEF_Reb"].sum()
-
-            # Derived metric
-            game_ast_to_ratio = round(game_total_assists / game_total_turnovers, 2) if game_total_turnovers != 0 else game_total_assists
-else:
-    if selected_player != "Team":
-        player_df = game_df[game_df["Player"] == selected_player]
-
-        if player_df.empty:
-            game_total_assists = 0
-            game_total_turnovers = 0
-            game_total_off_rebs = 0
-            game_total_def_rebs = 0
-            game_ast_to_ratio = 0
-        else:
-            # Sum the stats for that player
-            game_total_assists = player_df["Ast"].sum()
-            game_total_turnovers = player_df["TO"].sum()
-            game_total_off_rebs = player_df["OFF_Reb"].sum()
-            game_total_def_rebs = player_df["DEF_Reb"].sum()
-
-            # Derived metric
-            game_ast_to_ratio = round(game_total_assists / game_total_turnovers, 2) if game_total_turnovers != 0 else game_total_assists
-
-    else: # For "Team", sum all players
-        game_total_assists = game_df["Ast"].sum()
-        game_total_turnovers = game_df["TO"].sum()
-        game_total_off_rebs = game_df["OFF_Reb"].sum()
-        game_total_def_rebs = game_df["DEF_Reb"].sum()
-        game_ast_to_ratio = round(game_total_assists / game_total_turnovers, 2) if game_total_turnovers != 0 else game_total_assists
-
-
 # -----------------------------
 # Tab 2: Player Stats Dashboard
 # -----------------------------
-with tab2:
+if active_tab == "Player Game Dashboard":
+        # Every player's totals for the selection are cached; switching players is a row lookup
+        game_frame, game_version, game_cells = sheet_selection("game")
+        game_total_assists, game_total_turnovers, game_total_off_rebs, game_total_def_rebs, game_ast_to_ratio = box_totals(
+            box_dashboard("game", game_version, game_frame, game_cells), player_filter)
+        # Possession log ratings (the log only covers games); per-game box stats use its game count
+        efficiency = None
+        if has_source("possessions"):
+            possession_data, possession_versions = load_data(("possessions",))
+            efficiency = efficiency_dashboard(
+                possession_versions["possessions"], possession_data["possessions"],
+                {"Week": week_filter, "Game": game_filter} if "Game" in game_types else None)
+        games_played = metric_value(efficiency, player_filter, "Games")
+        per_game = lambda total: metric_text(total / games_played if games_played > 0 else np.nan)
+        efficiency_text = lambda col, percent=False: metric_text(metric_value(efficiency, player_filter, col), percent)
+        # The log records who was on the floor, not who shot: a player's numbers are the team's with them on court
+        on_court = "" if player_filter is None else " On Court"
+        team_on_court = lambda label: label if player_filter is None else f"Team {label} On Court"
+
         st.markdown(
         """
         <div style="
@@ -477,13 +510,13 @@ with tab2:
         col1, col2, col3 = st.columns(3)
 
         with col1:
-            centered_metric("Points Per Game", "N/A")
+            centered_metric("Points Per Game" if player_filter is None else team_on_court("PTS/G"), efficiency_text("PPG"))
 
         with col2:
-            centered_metric("Assists Per Game", "N/A")
+            centered_metric("Assists Per Game", per_game(game_total_assists))
 
         with col3:
-            centered_metric("Rebs. Per Game", "N/A")
+            centered_metric("Rebs. Per Game", per_game(game_total_off_rebs + game_total_def_rebs))
 
         st.markdown(
             "<hr style='border: 1px solid #0033A0; margin-top: 1rem; margin-bottom: 0rem;'>",
@@ -494,13 +527,13 @@ with tab2:
         col1, col2, col3 = st.columns(3)
 
         with col1:
-            centered_metric("OFF Efficiency", "N/A")
+            centered_metric(f"OFF Efficiency{on_court}", efficiency_text("OFF Rtg"))
 
         with col2:
-            centered_metric("DEF Efficiency", "N/A")
+            centered_metric(f"DEF Efficiency{on_court}", efficiency_text("DEF Rtg"))
 
         with col3:
-            centered_metric("Net Efficiency", "N/A")
+            centered_metric(f"Net Efficiency{on_court}", efficiency_text("Net Rtg"))
 
         st.markdown(
             "<hr style='border: 1px solid #0033A0; margin-top: 1rem; margin-bottom: 0rem;'>",
@@ -511,16 +544,16 @@ with tab2:
         col1, col2, col3, col4 = st.columns(4)
 
         with col1:
-            centered_metric("eFG %", "N/A")
+            centered_metric(team_on_court("eFG %"), efficiency_text("eFG%", percent=True))
 
         with col2:
-            centered_metric("3PT %", "N/A")
+            centered_metric(team_on_court("3PT %"), efficiency_text("3PT%", percent=True))
 
         with col3:
-            centered_metric("2PT %", "N/A")
+            centered_metric(team_on_court("2PT %"), efficiency_text("2PT%", percent=True))
         
         with col4:
-            centered_metric("FT %", "N/A")
+            centered_metric(team_on_court("FT %"), efficiency_text("FT%", percent=True))
 
         st.markdown(
             "<hr style='border: 1px solid #0033A0; margin-top: 1rem; margin-bottom: 0rem;'>",
@@ -550,32 +583,17 @@ with tab2:
         with col6:
             centered_metric("Total Rebs", game_total_def_rebs + game_total_off_rebs)
 
-with tab3:
-
-    hustle = df_hustle.groupby('Player').agg(
-            {'Charges': 'sum',
-            'Steals/Deflections': 'sum',
-            'Ball Secured': 'sum',
-            'Wallups': 'sum',
-            'Floor Dives': 'sum',
-            'Blocks': 'sum',
-            'Screen Ast': 'sum',
-            'Help Ups': 'sum',
-            'O Rebs': 'sum',
-            'Daggers': 'sum'}
-        ).reset_index()
-    
-    hustle['Hustle Score'] = (hustle['Charges']* 3 
-                        + hustle['Steals/Deflections'] * 1
-                       + hustle['Ball Secured'] * 1
-                       + hustle['Wallups'] * 1
-                       + hustle['Floor Dives'] * 1
-                       + hustle['Blocks'] * 1
-                       + hustle['Screen Ast'] * 1
-                       + hustle['Help Ups'] * 1
-                       + hustle['O Rebs'] * 1
-                       + hustle['Daggers'] * 1)
-    
+if active_tab == "Lunch Pail Stats":
+
+    # Totals for the selection from the cached count matrix; the score is one product with the weights
+    groups, counts = hustle_counts(versions["hustle"], df_hustle)
+    mask = group_mask(groups, {"Week": None if selected_week == "Season" else selected_week,
+                               "Game/Practice": game_filter})
+    players, totals = sum_by(groups, counts, "Player", mask)
+    hustle = pd.DataFrame(totals, columns=HUSTLE_COLUMNS)
+    hustle.insert(0, "Player", pd.Series(players, dtype=object))
+    hustle['Hustle Score'] = weighted_scores(totals, HUSTLE_COLUMNS, HUSTLE_WEIGHTS)
+
     hustle = hustle.rename(columns={
     "Steals/Deflections": "Steals\nDEFs",
     "Ball Secured": "Ball\nSecured",
@@ -615,50 +633,7 @@ with tab3:
     else:
         title = f"Week {selected_week} Lunch Pail Stats"
 
-    fig, ax = plt.subplots(figsize=(32, 40))
-    fig.suptitle(title, fontsize=36, color='#0033A0', fontweight='bold', y=0.975)
-    ax.axis('off')
-
-    # Create table with Formatted DataFrame
-    table = plt.table(
-        cellText=hustle_display.values,
-        colLabels=hustle_display.columns,
-        cellLoc='center',
-        bbox=[-0.05, 0.13, 1.05, 0.95]
-    )
-
-    # Resize to ensure fit and readability
-    table.auto_set_font_size(False)
-    table.set_fontsize(28)
-    table.scale(1.4, 2.5)
-
-    # Change Color the header row
-    for key, cell in table.get_celld().items():
-        row, col = key
-        if row == 0:  # header row
-            cell.set_facecolor('#da1a32')
-            cell.set_linewidth(2.5)
-            cell.set_edgecolor('#0033A0')
-            cell.get_text().set_fontweight('bold')
-            cell.get_text().set_color('#0033A0')
-            cell.set_fontsize(30)
-        elif row == len(hustle_display):  # total row
-            cell.set_facecolor('black')
-            cell.set_linewidth(2.5)
-            cell.set_edgecolor('#0033A0')
-            cell.get_text().set_fontweight('bold')
-            cell.get_text().set_color('white')
-            cell.set_fontsize(30)
-        else:
-            cell.get_text().set_color('#0033A0')
-            cell.set_edgecolor('#0033A0')
-    
-            if row % 2 == 0:
-                cell.set_facecolor("#BDBDBDB0")  # light gray
-            else:
-                cell.set_facecolor('white')    # default white
-
-    st.pyplot(fig)
+    st.markdown(render_table(hustle_display, title=title), unsafe_allow_html=True)
 
 player_info = {
     "Asher Reynolds": {"number": 4, "position": "Guard"},
@@ -691,37 +666,13 @@ player_info = {
 selected_player_info = (lambda x: f"#{player_info[x]['number']} — {player_info[x]['position']}" 
                         if x in player_info else x)(selected_player)
 
-# Apply Game filter (if not "Season")
-if selected_game != "Season":
-    stats_df = stats_df[stats_df["Practice"] == str(selected_game)]
+if active_tab == "Player Practice Dashboard":
+        # Every player's totals for the selection are cached; switching players is a row lookup (practice sheet: also by Practice)
+        practice_frame, practice_version, practice_cells = sheet_selection("practice")
+        total_assists, total_turnovers, total_off_rebs, total_def_rebs, ast_to_ratio = box_totals(
+            box_dashboard("practice", practice_version, practice_frame, {**practice_cells, "Practice": game_filter}),
+            player_filter)
 
-if selected_player != "Team":
-    player_df = stats_df[stats_df["Player"] == selected_player]
-
-    if player_df.empty:
-        total_assists = 0
-        total_turnovers = 0
-        total_off_rebs = 0
-        total_def_rebs = 0
-        ast_to_ratio = 0
-    else:
-        # Sum the stats for that player
-        total_assists = player_df["Ast"].sum()
-        total_turnovers = player_df["TO"].sum()
-        total_off_rebs = player_df["OFF_Reb"].sum()
-        total_def_rebs = player_df["DEF_Reb"].sum()
-
-            # Derived metric
-        ast_to_ratio = round(total_assists / total_turnovers, 2) if total_turnovers != 0 else total_assists
-else:
-    # For "Team", sum all players
-    total_assists = stats_df["Ast"].sum()
-    total_turnovers = stats_df["TO"].sum()
-    total_off_rebs = stats_df["OFF_Reb"].sum()
-    total_def_rebs = stats_df["DEF_Reb"].sum()
-    ast_to_ratio = round(total_assists / total_turnovers, 2) if total_turnovers != 0 else total_assists
-
-with tab4:
         st.markdown(
         """
         <div style="
@@ -795,9 +746,6 @@ with tab4:
         with col3:
             centered_metric("Total Rebs", total_off_rebs + total_def_rebs)
 
-pickup_url = st.secrets["data"]["pickup_url"]
-pickup_df = pd.read_csv(pickup_url)
-
 player_info = {
     "Asher Reynolds": {"number": 4, "position": "Guard"},
     "Ben Roberts Smith": {"number": 12, "position": "Guard"},
@@ -829,26 +777,12 @@ player_info = {
 selected_player_info = (lambda x: f"#{player_info[x]['number']} — {player_info[x]['position']}" 
                         if x in player_info else x)(selected_player)
 
-if selected_player != "Team":
-    player_df = pickup_df[pickup_df["Player"] == selected_player]
-
-            # Sum the stats for that player
-    total_assists = player_df["Ast"].sum()
-    total_turnovers = player_df["TO"].sum()
-    total_off_rebs = player_df["OFF_Reb"].sum()
-    total_def_rebs = player_df["DEF_Reb"].sum()
+if active_tab == "Pickup Dashboard":
+        # Pickup sheet is its own cache entry, only fetched when this tab is built
+        pickup_data, pickup_versions = load_data(("pickup",))
+        total_assists, total_turnovers, total_off_rebs, total_def_rebs, ast_to_ratio = box_totals(
+            box_dashboard("pickup", pickup_versions["pickup"], pickup_data["pickup"], {}), player_filter)
 
-            # Derived metric
-    ast_to_ratio = round(total_assists / total_turnovers, 2) if total_turnovers != 0 else total_assists
-else:
-    # For "Team", sum all players
-    total_assists = pickup_df["Ast"].sum()
-    total_turnovers = pickup_df["TO"].sum()
-    total_off_rebs = pickup_df["OFF_Reb"].sum()
-    total_def_rebs = pickup_df["DEF_Reb"].sum()
-    ast_to_ratio = round(total_assists / total_turnovers, 2) if total_turnovers != 0 else total_assists
-
-with tab5:
         st.markdown(
         """
         <div style="
@@ -922,24 +856,12 @@ with tab5:
         with col3:
             centered_metric("Total Rebs", total_off_rebs + total_def_rebs)
 
-# --- Filtering Logic ---
-if selected_week_shot == "Season":
-    if selected_game != "Season":
-        game_df = game_df[
-            (game_df["GAME"] == str(selected_game))]
-    else:
-        game_df = game_df
-
-else:
-    if selected_game != "Season":
-        game_df = game_df[
-            (game_df["GAME"] == str(selected_game))
-            & (game_df["Week"].astype(str) == str(selected_week_shot))]
-    else:
-        game_df = game_df[
-            (game_df["Week"].astype(str) == str(selected_week_shot))]
+if active_tab == "Team Game Stats":
+    # --- Filtering Logic ---
+    game_frame, game_version, game_cells = sheet_selection("game")
+    game_groups, game_counts = box_cube("game", game_version, game_frame)
+    game_mask = group_mask(game_groups, game_cells)
 
-with tab6:
     st.markdown(
         """
         <div style="
@@ -956,7 +878,7 @@ with tab6:
         unsafe_allow_html=True
     )
 
-    if game_df.empty:
+    if not game_mask.any():
         st.markdown(
         styled_text(
             f"No Game Stats Available for {selected_game}",
@@ -969,17 +891,9 @@ with tab6:
         unsafe_allow_html=True
     )
     else:
-        game = game_df.groupby('Player').agg(
-            {
-                'Ast': 'sum',
-                'TO': 'sum',
-                'OFF_Reb': 'sum',
-                'DEF_Reb': 'sum'
-            }
-        ).reset_index()
-
-        # Fill all NaN with 0
-        game = game.fillna(0)
+        players, totals = sum_by(game_groups, game_counts, "Player", game_mask)
+        game = pd.DataFrame(totals, columns=BOX_COLUMNS)
+        game.insert(0, "Player", players)
 
         game['AST/TO Ratio'] = round(game['Ast'] / game['TO'].replace(0, np.nan), 2).fillna(0)
         game['Total Rebs'] = game['OFF_Reb'] + game['DEF_Reb']
@@ -1018,63 +932,14 @@ with tab6:
         # Create display version (without Game Score)
         game_display = game.drop(columns=['Game Score']).copy()
 
-        fig, ax = plt.subplots(figsize=(32, 32))
-        ax.axis('off')
+        st.markdown(render_table(game_display), unsafe_allow_html=True)
 
-        # Create table
-        table = plt.table(
-            cellText=game_display.values,
-            colLabels=game_display.columns,
-            cellLoc='center',
-            bbox=[-0.05, 0.13, 1.05, 0.95]
-        )
-
-        # Style table
-        table.auto_set_font_size(False)
-        table.set_fontsize(28)
-        table.scale(1.4, 2.5)
-
-        for key, cell in table.get_celld().items():
-            row, col = key
-            if row == 0:
-                cell.set_facecolor('#da1a32')
-                cell.set_linewidth(2.5)
-                cell.set_edgecolor('#0033A0')
-                cell.get_text().set_fontweight('bold')
-                cell.get_text().set_color('#0033A0')
-                cell.set_fontsize(30)
-            elif row == len(game_display):
-                cell.set_facecolor('black')
-                cell.set_linewidth(2.5)
-                cell.set_edgecolor('#0033A0')
-                cell.get_text().set_fontweight('bold')
-                cell.get_text().set_color('white')
-                cell.set_fontsize(30)
-            else:
-                cell.get_text().set_color('#0033A0')
-                cell.set_edgecolor('#0033A0')
-                cell.set_facecolor("#BDBDBDB0" if row % 2 == 0 else 'white')
-
-        st.pyplot(fig)
+if active_tab == "Team Practice Stats":
+    # --- Filtering Logic ---
+    practice_frame, practice_version = load_sheet("practice")
+    practice_groups, practice_counts = box_cube("practice", practice_version, practice_frame)
+    practice_mask = group_mask(practice_groups, {"Practice": game_filter, "Week": week_filter})
 
-# --- Filtering Logic ---
-if selected_week_shot == "Season":
-    if selected_game != "Season":
-        practice_df = practice_df[
-            (practice_df["Practice"] == str(selected_game))]
-    else:
-        practice_df = practice_df
-
-else:
-    if selected_game != "Season":
-        practice_df = practice_df[
-            (practice_df["Practice"] == str(selected_game))
-            & (practice_df["Week"].astype(str) == str(selected_week_shot))]
-    else:
-        practice_df = practice_df[
-            (practice_df["Week"].astype(str) == str(selected_week_shot))]
-
-with tab7:
     st.markdown(
         """
         <div style="
@@ -1091,7 +956,7 @@ with tab7:
         unsafe_allow_html=True
     )
     
-    if practice_df.empty:
+    if not practice_mask.any():
         st.markdown(
         styled_text(
             f"No Practice Stats Available for {selected_game}",
@@ -1104,17 +969,9 @@ with tab7:
         unsafe_allow_html=True
     )
     else:
-        practice = practice_df.groupby('Player').agg(
-            {
-                'Ast': 'sum',
-                'TO': 'sum',
-                'OFF_Reb': 'sum',
-                'DEF_Reb': 'sum'
-            }
-        ).reset_index()
-
-        # Fill all NaN with 0
-        practice = practice.fillna(0)
+        players, totals = sum_by(practice_groups, practice_counts, "Player", practice_mask)
+        practice = pd.DataFrame(totals, columns=BOX_COLUMNS)
+        practice.insert(0, "Player", players)
 
         
 
@@ -1155,62 +1012,18 @@ with tab7:
         # Create display version (without Practice Score)
         practice_display = practice.drop(columns=['Practice Score']).copy()
 
-        fig, ax = plt.subplots(figsize=(32, 36))
-        ax.axis('off')
-
-        # Create table
-        table = plt.table(
-            cellText=practice_display.values,
-            colLabels=practice_display.columns,
-            cellLoc='center',
-            bbox=[-0.05, 0.13, 1.05, 0.95]
-        )
+        st.markdown(render_table(practice_display), unsafe_allow_html=True)
 
-        # Style table
-        table.auto_set_font_size(False)
-        table.set_fontsize(28)
-        table.scale(1.4, 2.5)
-
-        for key, cell in table.get_celld().items():
-            row, col = key
-            if row == 0:
-                cell.set_facecolor('#da1a32')
-                cell.set_linewidth(2.5)
-                cell.set_edgecolor('#0033A0')
-                cell.get_text().set_fontweight('bold')
-                cell.get_text().set_color('#0033A0')
-                cell.set_fontsize(30)
-            elif row == len(practice_display):
-                cell.set_facecolor('black')
-                cell.set_linewidth(2.5)
-                cell.set_edgecolor('#0033A0')
-                cell.get_text().set_fontweight('bold')
-                cell.get_text().set_color('white')
-                cell.set_fontsize(30)
-            else:
-                cell.get_text().set_color('#0033A0')
-                cell.set_edgecolor('#0033A0')
-                cell.set_facecolor("#BDBDBDB0" if row % 2 == 0 else 'white')
-
-        st.pyplot(fig)# --- Filtering Logic ---
-
-if selected_week_shot == "Season":
-    if selected_game != "Season":
-        press_df = press_df[
-            (press_df["Game"] == str(selected_game))]
-    else:
-        press_df = press_df
+if active_tab == "Press Effectiveness":
+    # --- Filtering Logic ---
+    press_df, press_version = load_sheet("press")
+    # Both tables come from one slice of the cached press x game x week counts
+    groups, counts = press_counts(press_version, press_df)
+    mask = group_mask(groups, {"Game": game_filter, "Week": week_filter})
+    presses, totals = sum_by(groups, counts, "Press", mask)
+    press_totals = pd.DataFrame(totals, columns=PRESS_COLUMNS)
+    press_totals.insert(0, "Press", presses)
 
-else:
-    if selected_game != "Season":
-        press_df = press_df[
-            (press_df["Game"] == str(selected_game))
-            & (press_df["Week"].astype(str) == str(selected_week_shot))]
-    else:
-        press_df = press_df[
-            (press_df["Week"].astype(str) == str(selected_week_shot))]
-
-with tab8:
     st.markdown(
         """
         <div style="
@@ -1227,7 +1040,7 @@ with tab8:
         unsafe_allow_html=True
     )
     
-    if press_df.empty:
+    if press_totals.empty:
         st.markdown(
         styled_text(
             f"No Press Effectiveness Stats Available for {selected_game}",
@@ -1241,29 +1054,8 @@ with tab8:
     )
     
     else:
-        press = press_df.groupby('Press').agg(
-            {
-                'No Advantage': 'sum',
-                'Turnover': 'sum',
-                'Jailbreak': 'sum',
-                'BS Miss': 'sum',
-                'BS Make': 'sum',
-                'ES Make': 'sum',
-                'ES Miss': 'sum',
-                'Fouls': 'sum',
-                'Deflections': 'sum',
-                'Total': 'sum'
-            }
-        ).reset_index()
-
-        # Fill all NaN with 0
-        press = press.fillna(0)
-
-
-        cols = press.columns.tolist()
-        press = press[cols]
-
-        press['Press Score'] = press['No Advantage'] * 0.25 + press['Turnover'] * 2 - press['Jailbreak'] * 0.5 + press['BS Make'] * 0.5 + press['BS Miss'] * 1 - press['ES Make'] * 2 - press['ES Miss'] * 1 - press['Fouls'] * 1 + press['Deflections'] * 0.5
+        press = press_totals.copy()
+        press['Press Score'] = weighted_scores(totals, PRESS_COLUMNS, PRESS_SCORE_WEIGHTS)
         press['Press Score Per Press'] = round(press['Press Score'] / press['Total'], 2).fillna(0)
 
         # Sort Practice DataFrame
@@ -1290,47 +1082,7 @@ with tab8:
         # Create display version (without Practice Score)
         press_display = press.drop(columns=['No Advantage','Turnover','Jailbreak','BS Miss','BS Make','ES Make','ES Miss','Fouls','Deflections']).copy()
 
-        fig, ax = plt.subplots(figsize=(32, 36))
-        ax.axis('off')
-
-        # Create table
-        table = plt.table(
-            cellText=press_display.values,
-            colLabels=press_display.columns,
-            cellLoc='center',
-            bbox=[-0.05, 0.13, 1.05, 0.95]
-        )
-
-        # Style table
-        table.auto_set_font_size(False)
-        table.set_fontsize(28)
-        table.scale(1.4, 2.5)
-
-        last_row = len(press_display)
-
-        for key, cell in table.get_celld().items():
-            row, col = key
-            if row == 0:
-                cell.set_facecolor('#da1a32')
-                cell.set_linewidth(2.5)
-                cell.set_edgecolor('#0033A0')
-                cell.get_text().set_fontweight('bold')
-                cell.get_text().set_color('#0033A0')
-                cell.set_fontsize(30)
-
-            elif row == last_row:
-                cell.set_facecolor('black')
-                cell.set_linewidth(2.5)
-                cell.set_edgecolor('#0033A0')
-                cell.get_text().set_fontweight('bold')
-                cell.get_text().set_color('white')
-                cell.set_fontsize(30)
-            else:
-                cell.get_text().set_color('#0033A0')
-                cell.set_edgecolor('#0033A0')
-                cell.set_facecolor("#BDBDBDB0" if row % 2 == 0 else 'white')
-
-        st.pyplot(fig)
+        st.markdown(render_table(press_display), unsafe_allow_html=True)
 
     st.markdown(
         """
@@ -1348,7 +1100,7 @@ with tab8:
         unsafe_allow_html=True
     )
 
-    if press_df.empty:
+    if press_totals.empty:
         st.markdown(
             styled_text(
                 f"No Press Effectiveness Stats Available for {selected_game}",
@@ -1362,43 +1114,37 @@ with tab8:
         )
 
     else:
-        press_2 = press_df.groupby('Press').agg(
-            {
-                'No Advantage': 'sum',
-                'Turnover': 'sum',
-                'Jailbreak': 'sum',
-                'BS Miss': 'sum',
-                'BS Make': 'sum',
-                'ES Make': 'sum',
-                'ES Miss': 'sum',
-                'Fouls': 'sum',
-                'Deflections': 'sum',
-                'Total': 'sum'
-            }
-        ).reset_index()
-
-        press_2 = press_2.fillna(0)
-
-        # Calculate percentages
-        press_2['No Adv. %'] = (press_2['No Advantage'] / press_2['Total'] * 100).fillna(0)
-        press_2['TO %'] = (press_2['Turnover'] / press_2['Total'] * 100).fillna(0)
-        press_2['Jailbreak %'] = (press_2['Jailbreak'] / press_2['Total'] * 100).fillna(0)
-        denominator = press_2[['BS Miss','BS Make','ES Miss','ES Make']].sum(axis=1)
-        press_2['BS Miss %'] = (press_2['BS Miss'] / denominator * 100).fillna(0)
-        press_2['BS Make %'] = (press_2['BS Make'] / denominator * 100).fillna(0)
-        press_2['ES Make %'] = (press_2['ES Make'] / denominator * 100).fillna(0)
-        press_2['ES Miss %'] = (press_2['ES Miss'] / denominator * 100).fillna(0)
-        press_2['Fouls %'] = (press_2['Fouls'] / press_2['Total'] * 100).fillna(0)
-        press_2['DEFs %'] = (press_2['Deflections'] / press_2['Total'] * 100).fillna(0)
-
-        pct_cols = [
-            'No Adv. %', 'TO %', 'Jailbreak %', 'BS Miss %', 'BS Make %',
-            'ES Make %', 'ES Miss %', 'Fouls %', 'DEFs %'
-        ]
-
-        press_2[pct_cols] = press_2[pct_cols].apply(
-            lambda col: col.apply(lambda x: f"{x:.0f}%" if x.is_integer() else f"{x:.1f}%")
-        )
+        press_2 = press_totals.copy()
+
+        # Calculate percentages: possession outcomes per press, shot outcomes per shot, in one divide
+        shot_cols = ['BS Miss', 'BS Make', 'ES Make', 'ES Miss']
+        shares = {
+            'No Adv. %': 'No Advantage', 'TO %': 'Turnover', 'Jailbreak %': 'Jailbreak',
+            'BS Miss %': 'BS Miss', 'BS Make %': 'BS Make', 'ES Make %': 'ES Make', 'ES Miss %': 'ES Miss',
+            'Fouls %': 'Fouls', 'DEFs %': 'Deflections',
+        }
+        shots = press_2[shot_cols].sum(axis=1).to_numpy()
+        numerators = press_2[list(shares.values())].to_numpy(dtype=float)
+        denominators = np.column_stack([shots if col in shot_cols else press_2['Total'].to_numpy()
+                                        for col in shares.values()])
+        press_2[list(shares)] = np.divide(numerators * 100, denominators,
+                                          out=np.zeros_like(numerators), where=denominators > 0)
+
+        # -------------------------------
+        # THRESHOLD BENCHMARKS
+        # -------------------------------
+        benchmarks = {
+            "No Adv. %":   {"green": 40, "yellow": 30},
+            "TO %":        {"green": 25, "yellow": 15},
+            "Jailbreak %": {"green": 10, "yellow": 20, "low_is_good": True},
+            "BS Miss %":   {"green": 60, "yellow": 45},
+            "BS Make %":   {"green": 15, "yellow": 25, "low_is_good": True},
+            "ES Make %":   {"green": 10, "yellow": 20, "low_is_good": True},
+            "ES Miss %":   {"green": 20, "yellow": 30, "low_is_good": True},
+            "Fouls %":     {"green": 7.5, "yellow": 15, "low_is_good": True},
+            "DEFs %":      {"green": 35, "yellow": 25},
+        }
+        pct_cols = list(benchmarks)
 
         press_2 = press_2.sort_values(by=['Total'], ascending=False)
 
@@ -1407,111 +1153,15 @@ with tab8:
             'ES Make','ES Miss','Fouls','Deflections'
         ]).copy()
 
-        press_display_2 = press_display_2.rename(columns={
-            "No Adv. %": "No Adv.\n%",
-            "TO %": "TO\n%",
-            "Jailbreak %": "Jailbreak\n%",
-            "BS Miss %": "BS Miss\n%",
-            "BS Make %": "BS Make\n%",
-            "ES Make %": "ES Make\n%",
-            "ES Miss %": "ES Miss\n%",
-            "Fouls %": "Fouls\n%",
-            "DEFs %": "DEFs\n%"
-        })
-
         # Apply name splitting
         press_display_2['Press'] = press_display_2['Press'].apply(split_name)
 
-        # -------------------------------
-        # THRESHOLD BENCHMARKS
-        # -------------------------------
-        benchmarks = {
-            "No Adv.\n%":     {"green": 40, "yellow": 30},
-            "TO\n%":          {"green": 25, "yellow": 15},
-            "Jailbreak\n%":   {"green": 10,  "yellow": 20}, # lower = better
-            "BS Miss\n%":     {"green": 60, "yellow": 45},
-            "BS Make\n%":     {"green": 15, "yellow": 25},
-            "ES Make\n%":     {"green": 10, "yellow": 20}, # lower = better
-            "ES Miss\n%":     {"green": 20, "yellow": 30}, # lower = better
-            "Fouls\n%":       {"green": 7.5,  "yellow": 15},  # lower = better
-            "DEFs\n%":        {"green": 35, "yellow": 25}
-        }
-
-        # -------------------------------
-        # GET CELL COLOR FUNCTION
-        # -------------------------------
-        def get_color(col_name, value):
-            value = float(value.replace("%", ""))  # convert "25.3%" to 25.3
-            limits = benchmarks[col_name]
-
-            # Low is good (fouls)
-            if col_name == "Fouls\n%" or col_name == "ES Make\n%" or col_name == "ES Miss\n%" or col_name == "Jailbreak\n%" or col_name == "BS Make\n%":
-                if value == 0:
-                    return "white"
-                elif value <= limits["green"]:
-                    return "#4CAF50"
-                elif value <= limits["yellow"]:
-                    return "#FFEB3B"
-                else:
-                    return "#F44336"
-
-            # High is good
-            if value >= limits["green"]:
-                return "#4CAF50"
-            elif value >= limits["yellow"]:
-                return "#FFEB3B"
-            elif value == 0:
-                return "white"
-            else:
-                return "#F44336"
-
         # -------------------------------
         # BUILD TABLE
         # -------------------------------
-        fig, ax = plt.subplots(figsize=(32, 36))
-        ax.axis('off')
-
-        table = plt.table(
-            cellText=press_display_2.values,
-            colLabels=press_display_2.columns,
-            cellLoc='center',
-            bbox=[-0.05, 0.13, 1.05, 0.95]
-        )
-
-        table.auto_set_font_size(False)
-        table.set_fontsize(28)
-        table.scale(1.4, 2.5)
-
-        # -------------------------------
-        # APPLY FORMATTING + COLOR CODING
-        # -------------------------------
-        for (row, col), cell in table.get_celld().items():
-
-            # Header row
-            if row == 0:
-                cell.set_facecolor('#da1a32')
-                cell.set_linewidth(2.5)
-                cell.set_edgecolor('#0033A0')
-                cell.get_text().set_fontweight('bold')
-                cell.get_text().set_color('#0033A0')
-                cell.set_fontsize(30)
-                continue
-
-            # Base styling for non-header
-            cell.get_text().set_color('#0033A0')
-            cell.set_edgecolor('#0033A0')
-
-            # Get column name + cell value
-            col_name = press_display_2.columns[col]
-            cell_value = press_display_2.iloc[row-1, col]
-
-            # Only color % columns
-            if isinstance(cell_value, str) and cell_value.endswith("%"):
-                cell.set_facecolor(get_color(col_name, cell_value))
-                cell.get_text().set_color("black")
-            else:
-                # alternate shading for non-% cells
-                cell.set_facecolor("#BDBDBDB0" if row % 2 == 0 else 'white')
-
-
-        st.pyplot(fig)    
\ No newline at end of file
+        # Colours compare the one-decimal values the table shows; "%" is added at render time
+        press_display_2[pct_cols] = press_display_2[pct_cols].round(1)
+        colors = benchmark_colors(press_display_2, benchmarks)
+        labels = {col: col.replace(" %", "\n%") for col in pct_cols}
+        st.markdown(render_table(press_display_2.rename(columns=labels), colors=colors, total_row=False,
+                                 percent_cols=tuple(labels.values())), unsafe_allow_html=True)
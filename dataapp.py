@@ -0,0 +1,760 @@
+import io
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+import requests
+from streamlit.logger import get_logger
+
+from functionsapp import classify_zones, zone_type
+
+logger = get_logger(__name__)
+
+# -----------------------------
+# Data Sources
+# -----------------------------
+# Dataset name -> key under st.secrets["data"]. Every dataset the app reads
+# is declared here once and loaded through load_sources. With a local data
+# directory the dataset name is the file name instead (see local_source).
+DATA_SOURCES = {
+    "shooting": "shooting_url",
+    "hustle": "hustle_url",
+    "practice": "practice_url",
+    "game": "game_url",
+    "press": "press_url",
+    "pickup": "pickup_url",
+    "possessions": "possessions_url",
+}
+
+# -----------------------------
+# Schemas
+# -----------------------------
+# Dataset name -> {column: kind}. Only declared columns are read; each is
+# normalised once at ingest so filters can compare typed values directly
+# (shot logs also get a derived ZONE_TYPE column, see apply_schema):
+#   "category" - stripped text stored as a categorical
+#   "week"     - week label as text ("3", never 3 or 3.0), ordered naturally
+#   "count"    - whole number, blanks count as 0, int32 (see _downcast_ints)
+#   "coord"    - raw court coordinate, float32, blanks stay missing
+HUSTLE_COLUMNS = ['Charges', 'Steals/Deflections', 'Ball Secured', 'Wallups', 'Floor Dives',
+                  'Blocks', 'Screen Ast', 'Help Ups', 'O Rebs', 'Daggers']
+# Hustle Score weight per HUSTLE_COLUMNS entry (app.py reads overrides from [hustle] weights in secrets)
+DEFAULT_HUSTLE_WEIGHTS = dict.fromkeys(HUSTLE_COLUMNS, 1) | {'Charges': 3}
+PRESS_COLUMNS = ['No Advantage', 'Turnover', 'Jailbreak', 'BS Miss', 'BS Make',
+                 'ES Make', 'ES Miss', 'Fouls', 'Deflections', 'Total']
+# Press Score points per press outcome
+PRESS_SCORE_WEIGHTS = {'No Advantage': 0.25, 'Turnover': 2, 'Jailbreak': -0.5, 'BS Make': 0.5, 'BS Miss': 1,
+                       'ES Make': -2, 'ES Miss': -1, 'Fouls': -1, 'Deflections': 0.5}
+BOX_COLUMNS = ['Ast', 'TO', 'OFF_Reb', 'DEF_Reb']
+BOX_KEYS = ['Player', 'Week', 'Practice', 'GAME', 'TYPE']  # box score cube dimensions (those a sheet has)
+# Possession log ("efficiency stats.csv"): per-possession totals, summed per player on the floor
+POSSESSION_COLUMNS = ['OFF Poss', 'DEF Poss', 'Points Scored', 'Points Allowed',
+                      '2PA', '2PM', '3PA', '3PM', 'FTA', 'FTM']
+POSSESSION_KEYS = ['Week', 'Game']  # efficiency cube dimensions besides Player (those the log has)
+# Result -> field goal counts of the offense on that possession. Free throws are not
+# implied by a Result (trips of 1-3 shots, and-ones); they come from optional FTA/FTM columns
+RESULT_SHOTS = {'2PT Make': {'2PA': 1, '2PM': 1}, '2PT Miss': {'2PA': 1},
+                '3PT Make': {'3PA': 1, '3PM': 1}, '3PT Miss': {'3PA': 1}}
+
+SCHEMAS = {
+    "shooting": {
+        "PLAYER": "category", "WEEK": "week", "TYPE": "category", "GAME": "category",
+        "ZONE": "category", "SHOT_TYPE": "category", "SHOT_MADE_FLAG": "count",
+        "LOC_X": "coord", "LOC_Y": "coord",
+    },
+    "hustle": {
+        "Player": "category", "Week": "week", "Game/Practice": "category",
+        **{col: "count" for col in HUSTLE_COLUMNS},
+    },
+    "practice": {
+        "Player": "category", "Week": "week", "Practice": "category",
+        "TYPE": "category", "GAME": "category",
+        **{col: "count" for col in BOX_COLUMNS},
+    },
+    "game": {
+        "Player": "category", "Week": "week", "GAME": "category", "TYPE": "category",
+        **{col: "count" for col in BOX_COLUMNS},
+    },
+    "press": {
+        "Press": "category", "Game": "category", "Week": "week",
+        **{col: "count" for col in PRESS_COLUMNS},
+    },
+    "pickup": {
+        "Player": "category",
+        **{col: "count" for col in BOX_COLUMNS},
+    },
+    "possessions": {
+        "Week": "week", "Game": "category", "Team O/D": "category", "Lineup": "category",
+        "Result": "category", "Points Scored": "count", "Points Allowed": "count",
+        "FTA": "count", "FTM": "count",
+    },
+}
+
+MAX_WORKERS = 4        # upper bound on simultaneous downloads
+REQUEST_TIMEOUT = 30   # seconds per download
+DEFAULT_TTL = 300      # seconds before a cached sheet is revalidated
+CACHE_DIR = Path(__file__).resolve().parent / ".cache" / "data"
+VIEW_CACHE_SIZE = 64   # filtered views kept across sessions
+CATEGORY_RATIO = 0.5   # text columns with fewer distinct values than this share of rows become categoricals
+PARQUET_MAGIC = b"PAR1"
+INGEST_VERSION = 2     # bump when apply_schema derives columns differently, to retire old snapshots
+
+# url -> (version, DataFrame, watermark), so unchanged sheets skip parsing and
+# sheets that only grew parse just their new rows
+_parsed = {}
+_parsed_lock = threading.Lock()
+
+
+# -----------------------------
+# On-Disk HTTP Cache
+# -----------------------------
+def _cache_key(url):
+    return hashlib.sha1(url.encode()).hexdigest()[:16]
+
+
+def _cache_paths(url, cache_dir):
+    key = _cache_key(url)
+    return Path(cache_dir) / f"{key}.csv", Path(cache_dir) / f"{key}.json"
+
+
+def _read_cache(url, cache_dir):
+    raw_path, meta_path = _cache_paths(url, cache_dir)
+    try:
+        meta = json.loads(meta_path.read_text())
+        raw = raw_path.read_bytes()
+    except (OSError, ValueError):
+        return None, None
+    if meta.get("url") != url:
+        return None, None
+    return raw, meta
+
+
+def _write_cache(url, cache_dir, raw, meta):
+    raw_path, meta_path = _cache_paths(url, cache_dir)
+    try:
+        raw_path.parent.mkdir(parents=True, exist_ok=True)
+        if raw is not None:
+            tmp = raw_path.with_suffix(".csv.tmp")
+            tmp.write_bytes(raw)
+            os.replace(tmp, raw_path)
+        tmp = meta_path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(meta))
+        os.replace(tmp, meta_path)
+    except OSError as e:
+        logger.warning("Could not write data cache for %s: %s", url, e)
+
+
+# -----------------------------
+# Local Directory Backend
+# -----------------------------
+def local_source(data_dir, name):
+    """Path of dataset `name` in a local data directory: <name>.parquet if present, else <name>.csv."""
+    parquet = Path(data_dir) / f"{name}.parquet"
+    return str(parquet if parquet.exists() else Path(data_dir) / f"{name}.csv")
+
+
+def is_remote(url):
+    return url.startswith(("http://", "https://"))
+
+
+# -----------------------------
+# Fetch + Parse
+# -----------------------------
+def fetch_source(url, ttl=DEFAULT_TTL, cache_dir=CACHE_DIR):
+    """
+    Return (raw bytes, content digest) for a sheet URL or local file path.
+
+    Local files are read straight from disk. For URLs the last download is
+    kept on disk with its ETag/Last-Modified headers. Within `ttl` seconds
+    it is served without touching the network; after that a conditional
+    request is made and a 304 just re-stamps the copy. If the sheet cannot
+    be reached, the stale copy is served instead.
+    """
+    if not is_remote(url):
+        raw = Path(url).read_bytes()
+        return raw, hashlib.sha256(raw).hexdigest()
+
+    raw, meta = _read_cache(url, cache_dir)
+    now = time.time()
+    if meta and now - meta.get("checked_at", 0) < ttl:
+        return raw, meta["digest"]
+
+    headers = {}
+    if meta and meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta and meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+
+    try:
+        response = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+        if response.status_code == 304 and meta:
+            meta["checked_at"] = now
+            _write_cache(url, cache_dir, None, meta)
+            return raw, meta["digest"]
+        response.raise_for_status()
+    except requests.RequestException as e:
+        if meta:
+            logger.warning("Serving cached copy of %s: %s", url, e)
+            return raw, meta["digest"]
+        raise
+
+    raw = response.content
+    meta = {
+        "url": url,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "digest": hashlib.sha256(raw).hexdigest(),
+        "checked_at": now,
+    }
+    _write_cache(url, cache_dir, raw, meta)
+    return raw, meta["digest"]
+
+
+def week_sort_key(week):
+    """Sort key that orders week labels 1, 2, ..., 10 instead of 1, 10, 2."""
+    return (0, int(week), "") if str(week).isdigit() else (1, 0, str(week))
+
+
+def _normalise(series, kind):
+    if kind == "count":
+        return _downcast_ints(pd.to_numeric(series, errors="coerce").fillna(0))
+    if kind == "coord":
+        return pd.to_numeric(series, errors="coerce").astype("float32")
+    if kind == "week":
+        numbers = pd.to_numeric(series, errors="coerce")
+        whole = numbers.notna() & (numbers % 1 == 0)
+        text = series.astype("string").str.strip()
+        text = text.mask(whole, numbers[whole].astype("Int64").astype("string"))
+        categories = sorted(text.dropna().unique(), key=week_sort_key)
+        return pd.Categorical(text, categories=categories, ordered=True)
+    return series.astype("string").str.strip().astype("category")
+
+
+def apply_schema(frame, schema):
+    """Keep only the declared columns of a sheet and normalise each to its declared kind."""
+    frame = frame[[col for col in schema if col in frame.columns]]
+    frame = pd.DataFrame({col: _normalise(frame[col], schema[col]) for col in frame.columns})
+    if {"LOC_X", "LOC_Y"} <= set(frame.columns):
+        frame = label_zones(frame)
+    if "ZONE" in frame.columns:
+        frame["ZONE_TYPE"] = zone_types(frame["ZONE"])
+    return frame
+
+
+def zone_types(zones):
+    """Categorical "3PT"/"Midrange"/"Layup" per shot, mapped once per distinct zone."""
+    categories = zones.cat.categories
+    if not len(categories):  # every ZONE blank
+        return pd.Series(pd.Categorical([None] * len(zones)), index=zones.index)
+    types = pd.Index([zone_type(zone) for zone in categories])
+    codes = zones.cat.codes.to_numpy()
+    return pd.Series(pd.Categorical(types.take(codes).where(codes >= 0)), index=zones.index)
+
+
+def label_zones(frame):
+    """Fill missing ZONE labels of a shot log from its raw LOC_X/LOC_Y coordinates."""
+    zones = frame["ZONE"] if "ZONE" in frame.columns else pd.Series(pd.NA, index=frame.index, dtype="category")
+    missing = (zones.isna() & frame["LOC_X"].notna() & frame["LOC_Y"].notna()).to_numpy()
+    if missing.any():
+        labels = np.array(zones.astype(object))
+        labels[missing] = classify_zones(frame["LOC_X"].to_numpy()[missing], frame["LOC_Y"].to_numpy()[missing])
+        frame["ZONE"] = pd.Series(labels, index=frame.index).astype("category")
+    return frame
+
+
+def is_parquet(raw):
+    return raw[:4] == PARQUET_MAGIC
+
+
+def parse_source(raw, schema=None):
+    """Parse raw CSV or Parquet bytes into a typed DataFrame, pruned to `schema` when one is given."""
+    if is_parquet(raw):
+        frame = pd.read_parquet(io.BytesIO(raw))
+        if schema is None:
+            return compact_frame(frame)
+        return apply_schema(frame, schema)
+    if schema is None:
+        return compact_frame(pd.read_csv(io.BytesIO(raw)))
+    frame = pd.read_csv(io.BytesIO(raw), usecols=lambda col: col in schema)
+    return apply_schema(frame, schema)
+
+
+def _downcast_ints(series):
+    """
+    Whole numbers as int32, or the smallest wider type that holds them.
+
+    Not narrower: groupby sums keep a small column's dtype when they fit,
+    so adding int8 totals (OFF + DEF rebounds, scores) would wrap around.
+    """
+    series = pd.to_numeric(series, downcast="integer")
+    return series.astype("int32") if series.dtype.itemsize < 4 else series
+
+
+def append_rows(frame, tail, schema):
+    """
+    Concatenate newly parsed rows onto an already typed sheet.
+
+    Categorical columns get the union of both category sets (week labels
+    stay in natural order), so the result is typed exactly as if the whole
+    sheet had been parsed at once. The sheet may come from a Parquet
+    snapshot, whose categories are object rather than string dtype, so both
+    sides are brought to object categories first.
+    """
+    columns = {}
+    for col in frame.columns:
+        head, new = frame[col], tail[col]
+        if isinstance(head.dtype, pd.CategoricalDtype):
+            parts = [pd.Categorical.from_codes(part.cat.codes, part.cat.categories.astype(object))
+                     for part in (head, new)]
+            values = pd.api.types.union_categoricals(parts, ignore_order=True)
+            if schema.get(col) == "week":
+                categories = sorted(values.categories, key=week_sort_key)
+                values = values.set_categories(categories, ordered=True)
+            columns[col] = values
+        else:
+            columns[col] = _downcast_ints(pd.concat([head, new], ignore_index=True))
+    return pd.DataFrame(columns)
+
+
+def parse_tail(raw, watermark, schema):
+    """
+    Parse only the rows appended to a sheet since `watermark`, or None if it did not just grow.
+
+    The watermark records how many bytes of the sheet were imported and the
+    content digest of those bytes. The sheet counts as appended-to when its
+    first `size` bytes still hash to that digest and end on a row boundary;
+    anything else (edited or deleted rows, a new schema) needs a full parse.
+    """
+    if watermark is None or watermark["schema"] != schema or is_parquet(raw):
+        return None
+    size = watermark["size"]
+    if len(raw) < size or hashlib.sha256(raw[:size]).hexdigest() != watermark["digest"]:
+        return None
+    if not raw[:size].endswith((b"\n", b"\r")) and raw[size:size + 1] not in (b"\n", b"\r"):
+        return None
+    header = raw.split(b"\n", 1)[0].rstrip(b"\r")
+    body = raw[size:].lstrip(b"\r\n")
+    if not body.strip():
+        return None
+    return parse_source(header + b"\n" + body, schema)
+
+
+def compact_frame(frame):
+    """
+    Shrink an undeclared sheet in place and return it.
+
+    Low-cardinality text columns become categoricals and whole-number
+    columns are downcast to int32 (see _downcast_ints).
+    """
+    for col in frame.columns:
+        series = frame[col]
+        if isinstance(series.dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(series.dtype):
+            continue
+        if pd.api.types.is_string_dtype(series.dtype):
+            if series.nunique() <= max(1, len(series) * CATEGORY_RATIO):
+                frame[col] = series.astype("category")
+        elif pd.api.types.is_integer_dtype(series.dtype):
+            frame[col] = _downcast_ints(series)
+        elif pd.api.types.is_float_dtype(series.dtype) and series.notna().all() and (series % 1 == 0).all():
+            frame[col] = _downcast_ints(series)
+    return frame
+
+
+# -----------------------------
+# Selection Index
+# -----------------------------
+def build_index(frame):
+    """
+    Row positions of every value of every categorical column of a sheet.
+
+    Returns {column: (codes, {value: code}, [positions per code])}, built
+    once per data version so selections never rescan the table.
+    """
+    index = {}
+    for col in frame.columns:
+        series = frame[col]
+        if not isinstance(series.dtype, pd.CategoricalDtype):
+            continue
+        codes = series.cat.codes.to_numpy()
+        order = np.argsort(codes, kind="stable")
+        counts = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories))
+        starts = np.cumsum(counts) - counts + np.count_nonzero(codes < 0)
+        groups = [order[start:start + count] for start, count in zip(starts, counts)]
+        index[col] = (codes, {value: code for code, value in enumerate(series.cat.categories)}, groups)
+    return index
+
+
+def select_rows(frame, index, criteria):
+    """
+    Rows of `frame` matching every criterion, taken in one step.
+
+    `criteria` maps column -> wanted value, list of values, or None for no
+    filter. The criterion with the fewest matching rows supplies the
+    candidate positions and the others are checked only on those rows, so
+    the cost follows the size of the result rather than of the table. A
+    criterion on a column that is not indexed matches nothing.
+    """
+    wanted = {}
+    for col, values in criteria.items():
+        if values is None:
+            continue
+        if col not in index:
+            return frame.iloc[0:0]
+        lookup = index[col][1]
+        values = values if isinstance(values, (list, tuple)) else [values]
+        wanted[col] = [lookup[value] for value in values if value in lookup]
+    if not wanted:
+        return frame
+
+    def size(col):
+        return sum(len(index[col][2][code]) for code in wanted[col])
+
+    driver = min(wanted, key=size)
+    groups = index[driver][2]
+    positions = np.concatenate([groups[code] for code in wanted[driver]] or [np.empty(0, dtype=np.intp)])
+    if len(wanted[driver]) > 1:
+        positions.sort()
+    for col, codes in wanted.items():
+        if col != driver:
+            positions = positions[np.isin(index[col][0][positions], codes)]
+    return frame.take(positions)
+
+
+# -----------------------------
+# Count Matrices
+# -----------------------------
+def count_matrix(frame, by, columns):
+    """
+    Totals of `columns` per `by` group, aggregated once.
+
+    Returns (groups, counts): `groups` has one row of `by` values per group
+    and `counts` is a (groups x columns) array in `columns` order. Any
+    selection of groups is then a group_mask and its totals a sum_by. Rows
+    with a missing `by` value keep their own group, so unfiltered totals
+    still count them.
+    """
+    totals = frame.groupby(list(by), observed=True, sort=True, dropna=False)[list(columns)].sum()
+    counts = totals.to_numpy()
+    if counts.dtype.kind in "iub":
+        counts = counts.astype(np.int64)  # columns are downcast at ingest; their sums need the full range
+    return totals.index.to_frame(index=False), counts
+
+
+def group_mask(groups, criteria):
+    """
+    Rows of `groups` matching every criterion ({column: value}).
+
+    None means no filter on that column and a list matches any of its
+    values, as in select_rows.
+    """
+    mask = np.ones(len(groups), dtype=bool)
+    for col, values in criteria.items():
+        if values is None:
+            continue
+        values = values if isinstance(values, (list, tuple)) else [values]
+        mask &= groups[col].astype(object).isin(values).to_numpy()
+    return mask
+
+
+def sum_by(groups, counts, col, mask=None):
+    """Add up the count rows of each `col` value (only rows in `mask`); returns (values, totals)."""
+    keys = groups[col] if mask is None else groups[col][mask]
+    counts = counts if mask is None else counts[mask]
+    codes, values = pd.factorize(keys, sort=True)
+    totals = np.zeros((len(values), counts.shape[1]), dtype=counts.dtype)
+    keep = codes >= 0  # rows without a `col` value belong to no total
+    np.add.at(totals, codes[keep], counts[keep])
+    return list(values), totals
+
+
+def weighted_scores(counts, columns, weights):
+    """Score of every row of a count matrix: one product with the weight vector (missing weights are 0)."""
+    return counts @ np.array([weights.get(col, 0) for col in columns])
+
+
+def box_metrics(groups, counts, mask=None, by="Player", team="Team"):
+    """
+    Box score dashboard metrics of every `by` value, plus a `team` row, in one pass.
+
+    Returns a DataFrame indexed by player with the BOX_COLUMNS totals of the
+    cells in `mask` and their AST/TO ratio (NaN without turnovers). The team
+    row also counts cells with no player.
+    """
+    players, totals = sum_by(groups, counts, by, mask)
+    selected = counts if mask is None else counts[mask]
+    table = pd.DataFrame(np.vstack([totals, selected.sum(axis=0, keepdims=True)]),
+                         index=players + [team], columns=BOX_COLUMNS)
+    turnovers = table["TO"].to_numpy()
+    ratio = np.divide(table["Ast"].to_numpy(), turnovers, out=np.full(len(table), np.nan), where=turnovers != 0)
+    table["AST/TO"] = ratio.round(2)
+    return table
+
+
+# -----------------------------
+# Possession Efficiency
+# -----------------------------
+def possession_counts(log):
+    """
+    (possessions x POSSESSION_COLUMNS) counts of a possession log.
+
+    Each row is one OFF or DEF possession with its points; field goal
+    attempts and makes come from the Result of offensive possessions only.
+    Free throws are counted only when the log has FTA/FTM columns (makes
+    capped at attempts); without them FT% stays undefined.
+    """
+    side = log["Team O/D"].astype(object).str.strip().str.upper().to_numpy()
+    offense = side == "O"
+    counts = pd.DataFrame(0, index=log.index, columns=POSSESSION_COLUMNS, dtype=np.int64)
+    counts["OFF Poss"] = offense
+    counts["DEF Poss"] = side == "D"
+    counts["Points Scored"] = log["Points Scored"].to_numpy()
+    counts["Points Allowed"] = log["Points Allowed"].to_numpy()
+
+    # Field goal counts per distinct Result label (plus a zero row for blanks), then one take per possession
+    shot_columns = ['2PA', '2PM', '3PA', '3PM']
+    results = log["Result"].astype("category").cat
+    per_result = pd.DataFrame([RESULT_SHOTS.get(result, {}) for result in results.categories] + [{}],
+                              columns=shot_columns).fillna(0).to_numpy(dtype=np.int64)
+    counts[shot_columns] = per_result[results.codes.to_numpy()] * offense[:, None]
+    if {"FTA", "FTM"} <= set(log.columns):
+        attempts = log["FTA"].to_numpy(dtype=np.int64)
+        counts["FTA"] = attempts * offense
+        counts["FTM"] = np.minimum(log["FTM"].to_numpy(dtype=np.int64), attempts) * offense
+    return counts
+
+
+def lineup_members(lineups):
+    """
+    (row position, player) of everyone on the floor for each possession.
+
+    Every distinct Lineup string ("A, B, C, D, E") is split once; possessions
+    are then matched to their lineup's members with one merge.
+    """
+    lineups = lineups.astype("category")
+    members = lineups.cat.categories.to_series().str.split(",").explode().str.strip()
+    members = members[members.fillna("") != ""]
+    by_lineup = pd.DataFrame({"code": lineups.cat.categories.get_indexer(members.index), "player": members.to_numpy()})
+    rows = pd.DataFrame({"row": np.arange(len(lineups)), "code": lineups.cat.codes.to_numpy()})
+    pairs = rows.merge(by_lineup, on="code")
+    return pairs["row"].to_numpy(), pairs["player"].to_numpy()
+
+
+def efficiency_cube(log, team="Team"):
+    """
+    Possession totals per player/week/game, plus a `team` player on every possession.
+
+    Players are exploded from each possession's Lineup, so a player's totals
+    cover the possessions they were on the floor for. Returns (groups, counts)
+    like count_matrix, keyed by Player and the POSSESSION_KEYS the log has.
+    """
+    keys = [col for col in POSSESSION_KEYS if col in log.columns]
+    # Possessions collapse to one row per lineup per game before the explode
+    possessions = possession_counts(log)
+    possessions[keys + ["Lineup"]] = log[keys + ["Lineup"]]
+    lineups, counts = count_matrix(possessions, keys + ["Lineup"], POSSESSION_COLUMNS)
+    rows, players = lineup_members(lineups["Lineup"])
+    rows = np.concatenate([rows, np.arange(len(lineups))])
+    players = np.concatenate([players, np.full(len(lineups), team, dtype=object)])
+    members = pd.DataFrame(counts[rows], columns=POSSESSION_COLUMNS)
+    members["Player"] = pd.Categorical(players)
+    for col in keys:
+        members[col] = lineups[col].to_numpy()[rows]
+    return count_matrix(members, ["Player", *keys], POSSESSION_COLUMNS)
+
+
+def efficiency_metrics(groups, counts, mask=None):
+    """
+    Offensive/defensive ratings and shooting percentages of every player in one pass.
+
+    Ratings are points per 100 possessions on the floor; percentages are of
+    the team's shots with the player on the floor. Games counts the game
+    cells a player appears in (NaN when the log has no Game column).
+    Undefined ratios are NaN.
+    """
+    players, totals = sum_by(groups, counts, "Player", mask)
+    table = pd.DataFrame(totals, index=players, columns=POSSESSION_COLUMNS)
+    if "Game" in groups.columns:
+        table["Games"] = sum_by(groups, np.ones((len(groups), 1), np.int64), "Player", mask)[1][:, 0]
+    else:
+        table["Games"] = np.nan
+
+    def ratio(numerator, denominator, scale=1):
+        numerator = np.asarray(numerator, dtype=float)
+        denominator = np.asarray(denominator, dtype=float)
+        return scale * np.divide(numerator, denominator, out=np.full(len(table), np.nan), where=denominator > 0)
+
+    field_goals = table["2PM"] + table["3PM"]
+    table["PPG"] = ratio(table["Points Scored"], table["Games"])
+    table["OFF Rtg"] = ratio(table["Points Scored"], table["OFF Poss"], 100)
+    table["DEF Rtg"] = ratio(table["Points Allowed"], table["DEF Poss"], 100)
+    table["Net Rtg"] = table["OFF Rtg"] - table["DEF Rtg"]
+    table["eFG%"] = ratio(field_goals + 0.5 * table["3PM"], table["2PA"] + table["3PA"], 100)
+    table["3PT%"] = ratio(table["3PM"], table["3PA"], 100)
+    table["2PT%"] = ratio(table["2PM"], table["2PA"], 100)
+    table["FT%"] = ratio(table["FTM"], table["FTA"], 100)
+    return table
+
+
+class ViewCache:
+    """
+    Bounded LRU of computed views shared by every session, with hit/miss counters.
+
+    Keys should include the data versions the view was computed from, so a
+    refreshed sheet never serves a stale view. Cached values are shared and
+    must be treated as read-only. By default `maxsize` counts entries; pass
+    `weigh` (e.g. len for bytes) to bound the total weight instead.
+    """
+
+    def __init__(self, maxsize=VIEW_CACHE_SIZE, weigh=None):
+        self.maxsize = maxsize
+        self.weigh = weigh or (lambda value: 1)
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._weight = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, compute):
+        """Return the cached view for `key`, calling `compute()` to build it on a miss."""
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+            self.misses += 1
+        value = compute()
+        with self._lock:
+            if key in self._items:
+                self._weight -= self.weigh(self._items[key])
+            self._items[key] = value
+            self._items.move_to_end(key)
+            self._weight += self.weigh(value)
+            while self._weight > self.maxsize and len(self._items) > 1:
+                self._weight -= self.weigh(self._items.popitem(last=False)[1])
+        logger.debug("View cache miss for %s (%d hits, %d misses)", key, self.hits, self.misses)
+        return value
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._items), "weight": self._weight}
+
+
+# -----------------------------
+# Columnar Snapshots
+# -----------------------------
+def _snapshot_path(url, version, cache_dir):
+    return Path(cache_dir) / f"{_cache_key(url)}.{version[:16]}.parquet"
+
+
+def _version(digest, schema):
+    """Content digest combined with the schema (and ingest logic) it was parsed under."""
+    if schema is None:
+        return digest
+    key = digest + json.dumps(schema, sort_keys=True) + str(INGEST_VERSION)
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def read_snapshot(url, version, cache_dir=CACHE_DIR):
+    """Memory-map the typed Parquet snapshot of a sheet version, or None if there is none."""
+    path = _snapshot_path(url, version, cache_dir)
+    if not path.exists():
+        return None
+    try:
+        return pd.read_parquet(path, memory_map=True)
+    except (OSError, ImportError, ValueError) as e:
+        logger.warning("Could not read snapshot %s: %s", path, e)
+        return None
+
+
+def write_snapshot(url, version, frame, cache_dir=CACHE_DIR):
+    """Store a typed Parquet snapshot of a sheet version, replacing older versions of that sheet."""
+    path = _snapshot_path(url, version, cache_dir)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".parquet.tmp")
+        frame.to_parquet(tmp, index=False)
+        os.replace(tmp, path)
+        for old in path.parent.glob(f"{_cache_key(url)}.*.parquet"):
+            if old != path:
+                old.unlink(missing_ok=True)
+    except (OSError, ImportError, ValueError, TypeError) as e:
+        logger.warning("Could not write snapshot %s: %s", path, e)
+
+
+def _fetch_and_parse(url, schema, ttl, cache_dir):
+    start = time.perf_counter()
+    raw, digest = fetch_source(url, ttl=ttl, cache_dir=cache_dir)
+    version = _version(digest, schema)
+    downloaded = time.perf_counter()
+
+    with _parsed_lock:
+        cached = _parsed.get(url)
+    changed = cached is None or cached[0] != version
+    appended = 0
+    if not changed:
+        frame, origin = cached[1], "memory"
+    else:
+        # Local files are already on disk; only downloaded sheets get a snapshot in cache_dir
+        snapshot = is_remote(url)
+        frame, origin = (read_snapshot(url, version, cache_dir) if snapshot else None), "snapshot"
+        if frame is None:
+            tail = parse_tail(raw, cached[2], schema) if cached and schema else None
+            if tail is not None:
+                frame, origin, appended = append_rows(cached[1], tail, schema), "append", len(tail)
+            else:
+                frame, origin = parse_source(raw, schema), "csv"
+            if snapshot:
+                write_snapshot(url, version, frame, cache_dir)
+        with _parsed_lock:
+            _parsed[url] = (version, frame, {"schema": schema, "size": len(raw), "digest": digest})
+    parsed = time.perf_counter()
+    return frame, {"download": downloaded - start, "parse": parsed - downloaded,
+                   "changed": changed, "origin": origin, "appended": appended, "version": version}
+
+
+def load_sources(urls, max_workers=MAX_WORKERS, ttl=DEFAULT_TTL, cache_dir=CACHE_DIR):
+    """
+    Fetch and parse every distinct URL exactly once on a bounded thread pool.
+
+    `urls` maps dataset name -> URL; each sheet is pruned and typed by its
+    SCHEMAS entry. Names that share a URL share one download and one parsed
+    DataFrame. Sheets whose content did not change since the last call are
+    not re-parsed, sheets that only gained rows at the end parse just those
+    rows, and a downloaded sheet version seen by an earlier process is read
+    back from its Parquet snapshot instead of the CSV (local files are not
+    snapshotted). Returns (frames, timings), both keyed by dataset name;
+    timings hold the download and parse seconds of the underlying URL,
+    whether it changed, where the frame came from ("memory", "snapshot",
+    "append" or "csv"), how many rows were appended and its version
+    (content digest + schema).
+    """
+    names_by_url = {}
+    for name, url in urls.items():
+        names_by_url.setdefault(url, []).append(name)
+
+    frames, timings = {}, {}
+    start = time.perf_counter()
+    workers = max(1, min(max_workers, len(names_by_url)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_fetch_and_parse, url, SCHEMAS.get(names[0]), ttl, cache_dir): url
+            for url, names in names_by_url.items()
+        }
+        for future in as_completed(futures):
+            frame, timing = future.result()
+            for name in names_by_url[futures[future]]:
+                frames[name] = frame
+                timings[name] = timing
+
+    for name, timing in timings.items():
+        logger.info("Loaded %s: download %.2fs, parse %.2fs (%d rows from %s)",
+                    name, timing["download"], timing["parse"], len(frames[name]), timing["origin"])
+    logger.info("Loaded %d sources in %.2fs", len(names_by_url), time.perf_counter() - start)
+    return frames, timings
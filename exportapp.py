@@ -0,0 +1,106 @@
+"""
+Headless shot-chart export for printed reports.
+
+    python exportapp.py fixtures charts --workers 8
+    python exportapp.py "https://docs.google.com/...csv" charts
+
+Renders plot_zone_chart for every player x week x TYPE in the shooting
+sheet on a process pool and writes charts/<Player>/Week <w> <TYPE>.png.
+The source is a data folder (as for JP_DATA_DIR) or a shooting sheet URL.
+Charts whose zone numbers and settings match the last export are skipped
+unless --force is given.
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import matplotlib
+matplotlib.use("Agg")
+
+from dataapp import load_sources, local_source
+from functionsapp import figure_bytes, plot_zone_chart, zone_chart_key, zone_chart_stats
+
+MANIFEST = "manifest.json"  # file name -> content hash of the chart last written there
+
+
+def chart_jobs(shots, size=18, dpi=200, fmt="png"):
+    """One (file name, key, zone stats, settings) per player/week/TYPE with at least one shot."""
+    settings = {"size": size, "dpi": dpi, "fmt": fmt}
+    for (player, week, kind), group in shots.groupby(["PLAYER", "WEEK", "TYPE"], observed=True, sort=True):
+        zone_stats = zone_chart_stats(group)
+        name = f"{player}/Week {week} {kind}.{fmt}"
+        yield name, zone_chart_key(zone_stats, **settings), zone_stats, settings
+
+
+def render_chart(out_dir, name, zone_stats, settings):
+    """Worker: draw one chart and write it under out_dir."""
+    fig = plot_zone_chart(None, size=settings["size"], dpi=settings["dpi"], zone_stats=zone_stats)
+    path = Path(out_dir) / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(figure_bytes(fig, dpi=settings["dpi"], fmt=settings["fmt"]))
+    return name
+
+
+def export_charts(shots, out_dir, workers=None, size=18, dpi=200, fmt="png", force=False):
+    """
+    Render every player/week/TYPE chart into out_dir on `workers` processes.
+
+    Returns the number of charts written and skipped; progress goes to stdout.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = out_dir / MANIFEST
+    manifest = {} if force or not manifest_path.exists() else json.loads(manifest_path.read_text())
+
+    jobs, skipped = [], 0
+    for name, key, zone_stats, settings in chart_jobs(shots, size, dpi, fmt):
+        if manifest.get(name) == key and (out_dir / name).exists():
+            skipped += 1
+            continue
+        jobs.append((name, key, zone_stats, settings))
+    print(f"{len(jobs):,} charts to render, {skipped:,} unchanged")
+
+    keys = {name: key for name, key, _, _ in jobs}
+    written = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(render_chart, out_dir, name, zone_stats, settings)
+                       for name, _, zone_stats, settings in jobs]
+            for future in as_completed(futures):
+                name = future.result()
+                manifest[name] = keys[name]
+                written += 1
+                if written % 25 == 0 or written == len(jobs):
+                    print(f"[{written}/{len(jobs)}] {name}")
+    finally:
+        # Keep whatever finished so an interrupted export resumes where it stopped
+        manifest_path.write_text(json.dumps(manifest, indent=1, sort_keys=True))
+    return written, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export every player/week/TYPE shot chart.")
+    parser.add_argument("source", help="data folder holding shooting.csv/.parquet, or the shooting sheet URL")
+    parser.add_argument("out_dir", help="folder to write the charts to")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="render processes")
+    parser.add_argument("--size", type=float, default=18, help="chart width/height in inches")
+    parser.add_argument("--dpi", type=int, default=200)
+    parser.add_argument("--format", choices=["png", "pdf", "svg"], default="png")
+    parser.add_argument("--force", action="store_true", help="re-render charts that have not changed")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    url = local_source(args.source, "shooting") if os.path.isdir(args.source) else args.source
+    frames, _ = load_sources({"shooting": url})
+    print(f"Loaded {len(frames['shooting']):,} shots in {time.perf_counter() - start:.2f}s")
+
+    written, skipped = export_charts(frames["shooting"], args.out_dir, args.workers,
+                                     args.size, args.dpi, args.format, args.force)
+    print(f"Wrote {written:,} charts ({skipped:,} unchanged) in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
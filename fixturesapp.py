@@ -0,0 +1,212 @@
+"""
+Synthetic season generator for running the dashboard offline.
+
+    python fixturesapp.py fixtures --scale 10
+    JP_DATA_DIR=fixtures streamlit run app.py
+
+Writes one <dataset>.csv (or .parquet) per DATA_SOURCES entry, plus a
+possession log shaped like "efficiency stats.csv", to the output folder.
+`--scale` multiplies the number of weeks, so 10 and 100 give 10x and 100x
+a real season's volume.
+"""
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from dataapp import BOX_COLUMNS, HUSTLE_COLUMNS
+from functionsapp import ZONE_COORDS, ZONE_PATHS
+
+# -----------------------------
+# Season Shape
+# -----------------------------
+PLAYERS = [
+    "Asher Reynolds", "Ben Roberts Smith", "Clark Smith", "Cray Luckett", "Ejay Napier",
+    "Hemming Williamson", "Joseph Chaney", "Judson Colley", "Kaden Griffin", "Kendrick Rogers",
+    "Manning Parks", "Miles Burkhalter", "William Thornton", "Abney Moss", "Bennett Rooker",
+]
+PRESSES = ["1-2-1-1", "2-2-1", "Diamond", "Run and Jump"]
+WEEKS = 12                                      # weeks in a real season (scale 1)
+SESSIONS = {"Game": 2, "Practice": 3, "Pickup": 1}  # sessions per week
+SHOTS_PER_PLAYER = {"Game": 6, "Practice": 14, "Pickup": 8}
+POSSESSIONS_PER_GAME = 60
+
+# Zone name -> (shot type, share of attempts, FG%)
+ZONES = {
+    "Right Corner 3": ("3PT", 0.05, 0.34), "Left Corner 3": ("3PT", 0.05, 0.34),
+    "Right Wing 3": ("3PT", 0.08, 0.31), "Left Wing 3": ("3PT", 0.08, 0.31),
+    "Top of Key 3": ("3PT", 0.08, 0.30),
+    "Right Midrange BL": ("Midrange", 0.04, 0.40), "Left Midrange BL": ("Midrange", 0.04, 0.40),
+    "RW Midrange": ("Midrange", 0.06, 0.41), "LW Midrange": ("Midrange", 0.06, 0.41),
+    "Right Center Midrange": ("Midrange", 0.05, 0.44), "Left Center Midrange": ("Midrange", 0.05, 0.44),
+    "Right Layup": ("Layup", 0.18, 0.58), "Left Layup": ("Layup", 0.18, 0.58),
+}
+# Hustle column -> mean per player per session
+HUSTLE_RATES = dict(zip(HUSTLE_COLUMNS, [0.2, 1.5, 0.8, 0.6, 0.3, 0.4, 0.7, 0.5, 0.9, 0.1]))
+BOX_RATES = dict(zip(BOX_COLUMNS, [1.8, 1.4, 1.0, 2.2]))
+# Press outcome -> probability per press possession
+PRESS_OUTCOMES = {"No Advantage": 0.35, "Turnover": 0.15, "Jailbreak": 0.12, "BS Miss": 0.14,
+                  "BS Make": 0.08, "ES Make": 0.08, "ES Miss": 0.08}
+# Possession result -> (probability, field goal points); free throws are drawn separately
+RESULTS = {"2PT Make": (0.26, 2), "2PT Miss": (0.24, 0), "3PT Make": (0.10, 3), "3PT Miss": (0.20, 0),
+           "FT": (0.06, 0), "Turnover": (0.14, 0)}
+FT_TRIP = {2: 0.85, 3: 0.15}  # shots per "FT" possession -> probability
+AND_ONE = 0.1                  # share of "2PT Make" possessions with one free throw
+FT_PCT = 0.68
+
+
+def schedule(scale=1):
+    """One row per session: Week, TYPE and its name ("Game 3", "Practice 7", ...)."""
+    rows, counts = [], dict.fromkeys(SESSIONS, 0)
+    for week in range(1, WEEKS * scale + 1):
+        for kind, per_week in SESSIONS.items():
+            for _ in range(per_week):
+                counts[kind] += 1
+                rows.append((str(week), kind, f"{kind} {counts[kind]}"))
+    return pd.DataFrame(rows, columns=["Week", "TYPE", "Session"])
+
+
+def _per_player(sessions):
+    """Cross join of sessions and the roster."""
+    return sessions.merge(pd.DataFrame({"Player": PLAYERS}), how="cross")
+
+
+def _counts(rng, n, rates):
+    return {col: rng.poisson(rate, n) for col, rate in rates.items()}
+
+
+# -----------------------------
+# Datasets
+# -----------------------------
+def shot_locations(rng, zone_names):
+    """Uniform raw LOC_X/LOC_Y inside each shot's zone outline, by rejection sampling its bounding box."""
+    x, y = np.empty(len(zone_names)), np.empty(len(zone_names))
+    for (name, coords), outline in zip(ZONE_COORDS.items(), ZONE_PATHS):
+        todo = np.flatnonzero(zone_names == name)
+        (x_min, y_min), (x_max, y_max) = coords.min(axis=0), coords.max(axis=0)
+        while len(todo):
+            cx = rng.uniform(x_min, x_max, 2 * len(todo))
+            cy = rng.uniform(y_min, y_max, 2 * len(todo))
+            keep = np.flatnonzero(outline.contains_points(np.column_stack([cx, cy])))[:len(todo)]
+            x[todo[:len(keep)]], y[todo[:len(keep)]] = cx[keep], cy[keep]
+            todo = todo[len(keep):]
+    return x.round(1), y.round(1)
+
+
+def make_shooting(rng, sessions):
+    rows = _per_player(sessions)
+    shots = rng.poisson(rows["TYPE"].map(SHOTS_PER_PLAYER).to_numpy())
+    rows = rows.loc[rows.index.repeat(shots)].reset_index(drop=True)
+
+    names = list(ZONES)
+    shot_type, share, fg = (np.array(col) for col in zip(*ZONES.values()))
+    zone = rng.choice(len(names), size=len(rows), p=share / share.sum())
+    loc_x, loc_y = shot_locations(rng, np.array(names)[zone])
+    return pd.DataFrame({
+        "PLAYER": rows["Player"], "WEEK": rows["Week"], "TYPE": rows["TYPE"], "GAME": rows["Session"],
+        "ZONE": np.array(names)[zone], "SHOT_TYPE": shot_type[zone],
+        "SHOT_MADE_FLAG": (rng.random(len(rows)) < fg[zone]).astype(int),
+        "LOC_X": loc_x, "LOC_Y": loc_y,
+    })
+
+
+def make_hustle(rng, sessions):
+    rows = _per_player(sessions[sessions["TYPE"] != "Pickup"])
+    return pd.DataFrame({"Player": rows["Player"], "Week": rows["Week"], "Game/Practice": rows["Session"],
+                         **_counts(rng, len(rows), HUSTLE_RATES)})
+
+
+def make_box(rng, sessions, kind):
+    rows = _per_player(sessions[sessions["TYPE"] == kind])
+    frame = pd.DataFrame({"Player": rows["Player"], "Week": rows["Week"]})
+    if kind == "Practice":
+        frame["Practice"] = rows["Session"]
+    frame["GAME"] = rows["Session"]
+    frame["TYPE"] = rows["TYPE"]
+    return frame.assign(**_counts(rng, len(rows), BOX_RATES))
+
+
+def make_press(rng, sessions):
+    games = sessions[sessions["TYPE"] == "Game"]
+    rows = games.merge(pd.DataFrame({"Press": PRESSES}), how="cross")
+    total = rng.poisson(8, len(rows))
+    outcomes = rng.multinomial(total, list(PRESS_OUTCOMES.values()))
+    frame = pd.DataFrame(outcomes, columns=list(PRESS_OUTCOMES))
+    frame.insert(0, "Week", rows["Week"].to_numpy())
+    frame.insert(0, "Game", rows["Session"].to_numpy())
+    frame.insert(0, "Press", rows["Press"].to_numpy())
+    frame["Fouls"] = rng.binomial(total, 0.07)
+    frame["Deflections"] = rng.binomial(total, 0.3)
+    frame["Total"] = total
+    return frame
+
+
+def make_possessions(rng, sessions):
+    games = sessions[sessions["TYPE"] == "Game"]
+    rows = games.loc[games.index.repeat(POSSESSIONS_PER_GAME)].reset_index(drop=True)
+    n = len(rows)
+    side = np.where(np.arange(n) % 2 == 0, "O", "D")
+    names = list(RESULTS)
+    prob, points = (np.array(col) for col in zip(*RESULTS.values()))
+    result = rng.choice(len(names), size=n, p=prob)
+    lineups = np.argsort(rng.random((n, len(PLAYERS))), axis=1)[:, :5]
+    roster = np.array(PLAYERS)
+    result_names = np.array(names)[result]
+    fta = np.where(result_names == "FT", rng.choice(list(FT_TRIP), size=n, p=list(FT_TRIP.values())), 0)
+    fta += (result_names == "2PT Make") & (rng.random(n) < AND_ONE)
+    ftm = rng.binomial(fta, FT_PCT)
+    scored = points[result] + ftm
+    return pd.DataFrame({
+        "Poss #": np.arange(1, n + 1), "Week": rows["Week"], "Game": rows["Session"], "Team O/D": side,
+        "Lineup": [", ".join(roster[ids]) for ids in lineups],
+        "Result": result_names,
+        "Points Scored": np.where(side == "O", scored, 0),
+        "Points Allowed": np.where(side == "D", scored, 0),
+        "FTA": fta, "FTM": ftm,
+    })
+
+
+def make_season(scale=1, seed=0):
+    """Generate every dataset for a synthetic season; returns {name: DataFrame}."""
+    rng = np.random.default_rng(seed)
+    sessions = schedule(scale)
+    return {
+        "shooting": make_shooting(rng, sessions),
+        "hustle": make_hustle(rng, sessions),
+        "practice": make_box(rng, sessions, "Practice"),
+        "game": make_box(rng, sessions, "Game"),
+        "press": make_press(rng, sessions),
+        "pickup": make_box(rng, sessions, "Pickup"),
+        "possessions": make_possessions(rng, sessions),
+    }
+
+
+def write_season(frames, out_dir, fmt="csv"):
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for name, frame in frames.items():
+        path = out_dir / f"{name}.{fmt}"
+        if fmt == "parquet":
+            frame.to_parquet(path, index=False)
+        else:
+            frame.to_csv(path, index=False)
+        print(f"{path}: {len(frame):,} rows")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic season for offline runs.")
+    parser.add_argument("out_dir", help="folder to write the datasets to")
+    parser.add_argument("--scale", type=int, default=1, help="multiple of a real season's weeks")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    write_season(make_season(args.scale, args.seed), args.out_dir, args.format)
+    print(f"Done in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
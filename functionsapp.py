@@ -1,9 +1,16 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib.patches import Circle, Rectangle, Arc, Polygon
+from matplotlib.collections import PathCollection
+from matplotlib.figure import Figure
+from matplotlib.path import Path
 import numpy as np
+import io
 import math
+import json
 import base64
+import hashlib
+import functools
 import streamlit as st
 
 # -----------------------------
@@ -48,14 +55,49 @@ def draw_hs_half_court(ax=None, color='blue', lw=2):
         ax.add_patch(el)
     return ax
 
+COURT_EXTENT = (-250, 250, -47.5, 422.5)  # x/y limits of every shot chart
+
+
+@functools.lru_cache(maxsize=1)
+def court_paths():
+    """
+    The lines of draw_hs_half_court as data-coordinate paths, built once.
+
+    Returns (paths, filled) where filled marks the solid free throw blocks.
+    """
+    ax = Figure().add_subplot()
+    draw_hs_half_court(ax)
+    paths, filled = [], []
+    for patch in ax.patches:
+        # Arc.get_path() is the full ellipse; only theta1..theta2 is drawn
+        path = Path.arc(patch.theta1, patch.theta2) if isinstance(patch, Arc) else patch.get_path()
+        paths.append(path.transformed(patch.get_patch_transform()))
+        filled.append(bool(patch.get_fill()) and not isinstance(patch, Arc))
+    return tuple(paths), tuple(filled)
+
+
+def draw_court_layer(ax, color='blue', lw=2):
+    """Add the prebuilt court to `ax` as a single collection (one artist instead of ~20 patches)."""
+    paths, filled = court_paths()
+    court = PathCollection(list(paths), facecolors=[color if f else 'none' for f in filled],
+                           edgecolors=color, linewidths=lw, zorder=1)
+    court.set_transform(ax.transData)
+    ax.add_collection(court, autolim=False)
+    return ax
+
 # -----------------------------
 # Zones
 # -----------------------------
-def get_updated_zones():
-    ARC_CX, ARC_CY = 0.0, -22.5
-    ARC_R = 237.0
-    R_OUT = ARC_R + 140.0
+ARC_CX, ARC_CY = 0.0, -22.5
+ARC_R = 237.0
+R_OUT = ARC_R + 140.0
+CORNER_X = 220.0   # corner 3 lines
+LANE_X = 72.0      # paint edges
+LAYUP_Y = 60.0     # top of the layup boxes
+CORNER_Y = ARC_CY + math.sqrt(ARC_R**2 - CORNER_X**2)  # where the corner lines meet the arc
+
 
+def _build_zone_coords():
     def polar_to_xy(angle_deg, radius, cx=ARC_CX, cy=ARC_CY):
         a = math.radians(angle_deg)
         return (cx + radius*math.cos(a), cy + radius*math.sin(a))
@@ -131,151 +173,230 @@ def get_updated_zones():
     zones['Right Center Midrange'] = midrange_center_arc_top_polygon(-72, 0, 60)
     zones['Left Center Midrange'] = midrange_center_arc_top_polygon(0, 72, 60)
 
-    # Convert to Polygon objects
-    poly_zones = {name: Polygon(coords, closed=True) for name, coords in zones.items()}
-    return poly_zones
+    return zones
+
+
+def _freeze(points):
+    points = np.array(points, dtype=float)
+    points.flags.writeable = False
+    return points
+
+
+# Zone outlines never change, so they are built once at import as read-only (n, 2) arrays
+ZONE_COORDS = {name: _freeze(coords) for name, coords in _build_zone_coords().items()}
+ZONE_NAMES = list(ZONE_COORDS)
+ZONE_PATHS = [Path(coords) for coords in ZONE_COORDS.values()]
+
+
+def _arc_slack():
+    """Widest gap between the 3PT arc and the straight outline edges drawn along it."""
+    slack = 0.0
+    for coords in ZONE_COORDS.values():
+        edges = np.stack([coords, np.roll(coords, -1, axis=0)], axis=1)
+        on_arc = (np.abs(np.hypot(edges[..., 0] - ARC_CX, edges[..., 1] - ARC_CY) - ARC_R) < 1e-6).all(axis=1)
+        mids = edges[on_arc].mean(axis=1)
+        if len(mids):
+            slack = max(slack, ARC_R - np.hypot(mids[:, 0] - ARC_CX, mids[:, 1] - ARC_CY).min())
+    return slack
+
+
+ARC_SLACK = _arc_slack() + 1e-6
+
+
+def get_updated_zones():
+    return {name: Polygon(coords, closed=True) for name, coords in ZONE_COORDS.items()}
+
+
+def zone_type(zone_name):
+    """Map a zone to its shot category: "3PT", "Midrange" or "Layup"."""
+    if "3" in zone_name:
+        return "3PT"
+    elif "Midrange" in zone_name:
+        return "Midrange"
+    else:
+        return "Layup"
+
+
+ZONE_TYPES = {name: zone_type(name) for name in ZONE_NAMES}
+
+
+def classify_zones(x, y):
+    """
+    Assign raw shot coordinates to zones in one vectorized pass.
+
+    `x` and `y` are arrays in court units (hoop at (0, -15), baseline at
+    y=-47.5). Returns an array of ZONE_NAMES labels, using the same lines
+    as the zone outlines: corner 3s, then the three 3PT sectors by angle,
+    then layups, center, baseline and wing midrange inside the arc. The
+    outlines follow the arc with straight edges, so points within ARC_SLACK
+    of it take the zone of the outline that contains them; a point inside
+    an outline always gets that outline's label.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    dx, dy = x - ARC_CX, y - ARC_CY
+    angle = np.degrees(np.arctan2(dy, dx))
+    left = x < 0  # "Right ..." zones sit at negative x
+
+    corner = (np.abs(x) > CORNER_X) & (y <= CORNER_Y)
+    three = corner | (dx**2 + dy**2 > ARC_R**2)
+    lane = np.abs(x) <= LANE_X
+    conditions = [
+        corner & left, corner,
+        three & (angle >= 110), three & (angle <= 70), three,
+        lane & (y <= LAYUP_Y) & left, lane & (y <= LAYUP_Y),
+        lane & left, lane,
+        (y <= CORNER_Y) & left, y <= CORNER_Y,
+        left,
+    ]
+    choices = ["Right Corner 3", "Left Corner 3",
+               "Right Wing 3", "Left Wing 3", "Top of Key 3",
+               "Right Layup", "Left Layup",
+               "Right Center Midrange", "Left Center Midrange",
+               "Right Midrange BL", "Left Midrange BL",
+               "RW Midrange"]
+    codes = np.select(conditions, [ZONE_NAMES.index(name) for name in choices], ZONE_NAMES.index("LW Midrange"))
+
+    near = np.flatnonzero(np.abs(np.hypot(dx, dy) - ARC_R) < ARC_SLACK)
+    if len(near):
+        points = np.column_stack([x[near], y[near]])
+        for code, path in enumerate(ZONE_PATHS):
+            codes[near[path.contains_points(points)]] = code
+    return np.asarray(ZONE_NAMES, dtype=object)[codes]
+
+# -----------------------------
+# Zone Styling
+# -----------------------------
+# FG% cut-offs per zone type: below "red" is red, ..., at or above "green" is dark green
+ZONE_THRESHOLDS = {
+    "3PT": {"red": 25, "orange": 29, "yellow": 33, "green": 36},
+    "Midrange": {"red": 35, "orange": 40, "yellow": 45, "green": 52},
+    "Layup": {"red": 45, "orange": 55, "yellow": 60, "green": 65},
+}
+MIN_ALPHA, MAX_ALPHA = 0.2, 0.8  # zone opacity for the fewest / most attempts
+
+# Label nudges (dx, dy) so text clears the court lines
+ZONE_LABEL_OFFSETS = {
+    "LW Midrange": (20, -30), "RW Midrange": (-20, -30), "Left Midrange BL": (20, 0),
+    "Top of Key 3": (0, -10), "Left Center Midrange": (0, -10), "Right Center Midrange": (0, -10),
+    "Left Layup": (10, 0), "Right Layup": (10, 0), "Left Corner 3": (3, 0), "Right Corner 3": (3, 0),
+}
+ZONE_LABEL_XY = {
+    name: tuple(np.mean(poly.get_xy(), axis=0) + ZONE_LABEL_OFFSETS.get(name, (0, 0)))
+    for name, poly in get_updated_zones().items()
+}
+
+
+def zone_color(zone_name, fg):
+    """Fill colour for a zone's FG% against its zone type's thresholds."""
+    t = ZONE_THRESHOLDS[ZONE_TYPES[zone_name]]
+    for color in ("red", "orange", "yellow", "green"):
+        if fg < t[color]:
+            return color
+    return "darkgreen"
+
+
+def zone_alpha(attempts, max_attempts):
+    """Zone opacity scaled by its share of the busiest zone's attempts."""
+    return MIN_ALPHA + (attempts / max_attempts) * (MAX_ALPHA - MIN_ALPHA)
+
 
 # -----------------------------
 # Final Plot
 # -----------------------------
-def plot_zone_chart(filtered_df, df_team):
+def zone_chart_stats(filtered_df):
+    """Per-zone makes, attempts and FG% for the player/game selection."""
+    zone_stats = filtered_df.groupby('ZONE', observed=True).agg(
+        makes=('SHOT_MADE_FLAG', 'sum'),
+        attempts=('SHOT_MADE_FLAG', 'count')
+    ).reset_index()
+    zone_stats['FG%'] = (zone_stats['makes'] / zone_stats['attempts']) * 100
+    return zone_stats
+
+
+def zone_chart_key(zone_stats, **settings):
+    """Content hash of what a zone chart shows: per-zone makes/attempts plus render settings."""
+    content = {
+        "zones": [[str(zone), int(makes), int(attempts)] for zone, makes, attempts
+                  in zone_stats[['ZONE', 'makes', 'attempts']].itertuples(index=False)],
+        "settings": settings,
+    }
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()
+
+
+def density_chart_key(attempts, makes, **settings):
+    """Content hash of what a density chart shows: the binned grids plus render settings."""
+    digest = hashlib.sha256(np.ascontiguousarray(attempts).tobytes())
+    digest.update(np.ascontiguousarray(makes).tobytes())
+    digest.update(json.dumps(settings, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def figure_bytes(fig, dpi=200, fmt="png"):
+    """Render a figure to image bytes and close it."""
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=fmt, dpi=dpi, bbox_inches="tight")
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+def plot_zone_chart(filtered_df, size=18, dpi=200, zone_stats=None):
     """
     Plot a basketball shot chart by zone with:
-    - Red/green color based on relative FG% vs team benchmark
+    - Red to green color from fixed FG% thresholds per zone type
     - Multi-thresholds
     - Alpha scaled by attempts
+
+    `size` is the figure width/height in inches; pass `zone_stats` from
+    zone_chart_stats when it has already been computed.
     """
     # -----------------------------
     # Calculate per-zone stats for the player/game selection
     # -----------------------------
-    zone_stats = filtered_df.groupby('ZONE').agg(
-        makes=('SHOT_MADE_FLAG', 'sum'),
-        attempts=('SHOT_MADE_FLAG', 'count')
-    ).reset_index()
-    zone_stats['FG%'] = (zone_stats['makes'] / zone_stats['attempts']) * 100
+    if zone_stats is None:
+        zone_stats = zone_chart_stats(filtered_df)
 
-    # -----------------------------
-    # Calculate team benchmarks per zone type
-    # -----------------------------
-    # Map zones to 3 categories
-    def get_zone_type(zone_name):
-        if "3" in zone_name:
-            return "3PT"
-        elif "Midrange" in zone_name:
-            return "Midrange"
-        else:
-            return "Layup"
-
-    df_team['ZONE_TYPE'] = df_team['ZONE'].apply(get_zone_type)
-    team_benchmarks = df_team.groupby('ZONE_TYPE')['SHOT_MADE_FLAG'].mean() * 100  # FG% per type
+    # One lookup per zone instead of a filter per zone
+    stats_by_zone = {
+        str(zone): (makes, attempts, fg) for zone, makes, attempts, fg
+        in zone_stats[['ZONE', 'makes', 'attempts', 'FG%']].itertuples(index=False)
+    }
 
     # -----------------------------
     # Prepare polygons
     # -----------------------------
     zone_polys = get_updated_zones()
 
-    fig, ax = plt.subplots(figsize=(18, 18), dpi=200)
-    draw_hs_half_court(ax)
-    ax.set_xlim(-250, 250)
-    ax.set_ylim(-47.5, 422.5)
+    fig, ax = plt.subplots(figsize=(size, size), dpi=dpi)
+    draw_court_layer(ax)
+    ax.set_xlim(COURT_EXTENT[:2])
+    ax.set_ylim(COURT_EXTENT[2:])
     ax.axis('off')
 
-    # Alpha scaling
-    min_alpha = 0.2
-    max_alpha = 0.8
-    max_attempts = zone_stats['attempts'].max() if not zone_stats.empty else 1
+    font_size = 20 * size / 18  # labels keep their proportions at any figure size
 
-    thresholds = {
-    "3PT": {
-        "red": 25,
-        "orange": 29,
-        "yellow": 33,
-        "green": 36
-    },
-    "Midrange": {
-        "red": 35,
-        "orange": 40,
-        "yellow": 45,
-        "green": 52
-    },
-    "Layup": {
-        "red": 45,
-        "orange": 55,
-        "yellow": 60,
-        "green": 65
-    }
-}
+    max_attempts = zone_stats['attempts'].max() if not zone_stats.empty else 1
 
     for zone_name, poly in zone_polys.items():
-        if zone_name not in zone_stats['ZONE'].values:
+        if zone_name not in stats_by_zone:
             continue
 
-        stats = zone_stats[zone_stats['ZONE'] == zone_name].iloc[0]
-        zone_fg = stats['FG%']
-        attempts = stats['attempts']
-
-        # Determine zone type
-        z_type = get_zone_type(zone_name)
-
-        # -----------------------------
-        # Multi-threshold color logic
-        # -----------------------------
-        # thresholds (relative to benchmark)
-        t = thresholds[z_type]  # get thresholds for this zone type
-        fg = zone_fg            # player FG% in that zone
-
-        if fg < t["red"]:
-            color = "red"
-        elif fg < t["orange"]:
-            color = "orange"
-        elif fg < t["yellow"]:
-            color = "yellow"
-        elif fg < t["green"]:
-            color = "green"
-        else:
-            color = "darkgreen"
-
-        # -----------------------------
-        # Alpha scaling based on attempts
-        # -----------------------------
-        alpha = min_alpha + (attempts / max_attempts) * (max_alpha - min_alpha)
+        makes, attempts, zone_fg = stats_by_zone[zone_name]
 
         # Draw zone
         ax.add_patch(Polygon(
             poly.get_xy(), closed=True,
-            facecolor=color, alpha=alpha, edgecolor='black', linestyle='--'
+            facecolor=zone_color(zone_name, zone_fg), alpha=zone_alpha(attempts, max_attempts),
+            edgecolor='black', linestyle='--'
         ))
 
-        # -----------------------------
         # Text placement
-        # -----------------------------
-        xs = poly.get_xy()[:, 0]
-        ys = poly.get_xy()[:, 1]
-        cx, cy = np.mean(xs), np.mean(ys)
-
-        # Offset LW and RW Midrange text slightly
-        if zone_name in ['LW Midrange', 'RW Midrange']:
-            cy -= 30
-        if zone_name == 'RW Midrange':
-            cx -= 20
-        if zone_name == 'LW Midrange':
-            cx += 20
-        if zone_name == 'Left Midrange BL':
-            cx += 20
-        if zone_name in ['Top of Key 3', 'Left Center Midrange', 'Right Center Midrange']:
-            cy -= 10
-        if zone_name == 'Left Layup':
-            cx += 10
-        if zone_name == 'Right Layup':
-            cx += 10
-        if zone_name in ['Left Corner 3', 'Right Corner 3']:
-            cx += 3
-
-        ax.text(cx, cy + 20, f"{int(stats['makes'])}/{int(stats['attempts'])}",
-                ha='center', va='center', fontsize=20, weight='bold',
+        cx, cy = ZONE_LABEL_XY[zone_name]
+        ax.text(cx, cy + 20, f"{int(makes)}/{int(attempts)}",
+                ha='center', va='center', fontsize=font_size, weight='bold',
                 bbox=dict(facecolor='lightgray', alpha=0.6, edgecolor='none', pad=2))
         ax.text(cx, cy, f"{zone_fg:.1f}%",
-                ha='center', va='center', fontsize=20,
+                ha='center', va='center', fontsize=font_size,
                 bbox=dict(facecolor='lightgray', alpha=0.6, edgecolor='none', pad=2))
     plt.tight_layout()
     fig.subplots_adjust(top=1, bottom=0.05)
@@ -283,12 +404,199 @@ def plot_zone_chart(filtered_df, df_team):
     return fig
 
 
+
+def _svg_path(path, x0, y1):
+    """SVG path data for a matplotlib Path, with y flipped so the court's top edge is y=0."""
+    commands = {Path.MOVETO: "M", Path.LINETO: "L", Path.CURVE3: "Q", Path.CURVE4: "C"}
+    parts = []
+    for vertices, code in path.iter_segments(simplify=False, curves=True):
+        if code == Path.CLOSEPOLY:
+            parts.append("Z")
+            continue
+        points = vertices.reshape(-1, 2)
+        parts.append(commands[code] + " ".join(f"{x - x0:.1f},{y1 - y:.1f}" for x, y in points))
+    return "".join(parts)
+
+
+@functools.lru_cache(maxsize=1)
+def court_svg():
+    """The court lines as two SVG path strings (outlines, solid blocks), built once."""
+    x0, _, _, y1 = COURT_EXTENT
+    paths, filled = court_paths()
+    lines = "".join(_svg_path(p, x0, y1) for p, f in zip(paths, filled) if not f)
+    blocks = "".join(_svg_path(p, x0, y1) for p, f in zip(paths, filled) if f)
+    return lines, blocks
+
+
+@functools.lru_cache(maxsize=1)
+def zone_svg_paths():
+    """Zone polygons from ZONE_COORDS as SVG path strings, built once."""
+    x0, _, _, y1 = COURT_EXTENT
+    return {name: "M" + "L".join(f"{x - x0:.1f},{y1 - y:.1f}" for x, y in coords) + "Z"
+            for name, coords in ZONE_COORDS.items()}
+
+
+def plot_zone_chart_svg(zone_stats, color='blue', font_size=7.5):
+    """
+    The zone chart of plot_zone_chart as a compact SVG document.
+
+    Takes the per-zone numbers from zone_chart_stats and reuses the cached
+    court and zone outlines, so the payload is a few kilobytes and the
+    browser scales it without another render. `font_size` is in court units
+    (the court is 500 wide).
+    """
+    x0, x1, y0, y1 = COURT_EXTENT
+    width, height = x1 - x0, y1 - y0
+    lines, blocks = court_svg()
+    zone_paths = zone_svg_paths()
+    max_attempts = zone_stats['attempts'].max() if not zone_stats.empty else 1
+
+    zones, labels = [], []
+    for zone, makes, attempts, zone_fg in zone_stats[['ZONE', 'makes', 'attempts', 'FG%']].itertuples(index=False):
+        zone = str(zone)
+        if zone not in zone_paths:
+            continue
+        zones.append(f'<path d="{zone_paths[zone]}" fill="{zone_color(zone, zone_fg)}" '
+                     f'fill-opacity="{zone_alpha(attempts, max_attempts):.2f}"/>')
+        cx, cy = ZONE_LABEL_XY[zone]
+        for text, dy, weight in ((f"{int(makes)}/{int(attempts)}", 20, "bold"), (f"{zone_fg:.1f}%", 0, "normal")):
+            x, y = cx - x0, y1 - (cy + dy)
+            box_w, box_h = 0.62 * font_size * len(text) + 3, font_size * 1.3
+            labels.append(f'<rect x="{x - box_w / 2:.1f}" y="{y - box_h / 2:.1f}" width="{box_w:.1f}" '
+                          f'height="{box_h:.1f}" fill="lightgray" fill-opacity="0.6"/>'
+                          f'<text x="{x:.1f}" y="{y:.1f}" font-weight="{weight}">{text}</text>')
+
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width:g} {height:g}" '
+        f'font-family="sans-serif" font-size="{font_size}">'
+        f'<path d="{lines}" fill="none" stroke="{color}" stroke-width="1.5"/>'
+        f'<path d="{blocks}" fill="{color}" stroke="{color}" stroke-width="1.5"/>'
+        f'<g stroke="black" stroke-dasharray="4 2" stroke-width="0.8">{"".join(zones)}</g>'
+        f'<g text-anchor="middle" dominant-baseline="central">{"".join(labels)}</g>'
+        '</svg>'
+    )
+
+
+# -----------------------------
+# Shot Density
+# -----------------------------
+DENSITY_BINS = (25, 24)  # x/y bins over COURT_EXTENT (20 x ~20 court units each)
+
+
+def shot_bin_cube(df, by=("PLAYER", "WEEK", "TYPE", "GAME"), bins=DENSITY_BINS):
+    """
+    Attempts and makes per court bin for every `by` group, from one pass over the shots.
+
+    Returns (groups, attempts, makes): `groups` has one row of `by` values per
+    group with located shots, and attempts/makes are (groups, nx, ny) uint16
+    arrays. Grids add, so any selection's grid is the sum of its groups'
+    (pick them with dataapp.group_mask) and a season is the sum of its
+    weeks. Shots with a blank `by` value keep their own group, as in
+    count_matrix.
+    """
+    x0, x1, y0, y1 = COURT_EXTENT
+    nx, ny = bins
+    x = df["LOC_X"].to_numpy(dtype=float)
+    y = df["LOC_Y"].to_numpy(dtype=float)
+    # Same half-open bins as np.histogram2d; shots without a location or off the court are dropped
+    on_court = (x >= x0) & (x <= x1) & (y >= y0) & (y <= y1)
+    ix = np.minimum(((x[on_court] - x0) / (x1 - x0) * nx).astype(np.intp), nx - 1)
+    iy = np.minimum(((y[on_court] - y0) / (y1 - y0) * ny).astype(np.intp), ny - 1)
+
+    grouped = df.groupby(list(by), observed=True, sort=True, dropna=False)
+    groups = grouped.size().index.to_frame(index=False)
+    group = grouped.ngroup().to_numpy(dtype=np.intp)[on_court]
+    flat = (group * nx + ix) * ny + iy
+    made = np.nan_to_num(df["SHOT_MADE_FLAG"].to_numpy(dtype=float)[on_court])
+
+    size = len(groups) * nx * ny
+    attempts = np.bincount(flat, minlength=size).astype(np.uint16).reshape(len(groups), nx, ny)
+    makes = np.bincount(flat, weights=made, minlength=size).astype(np.uint16).reshape(len(groups), nx, ny)
+    return groups, attempts, makes
+
+
+def smooth_grid(grid, sigma):
+    """Gaussian smoothing of a 2-D grid with a separable kernel; `sigma` is in bins."""
+    radius = max(1, int(math.ceil(3 * sigma)))
+    offsets = np.arange(-radius, radius + 1)
+    kernel = np.exp(-0.5 * (offsets / sigma) ** 2)
+    kernel /= kernel.sum()
+    grid = np.apply_along_axis(np.convolve, 0, grid.astype(float), kernel, mode="same")
+    return np.apply_along_axis(np.convolve, 1, grid, kernel, mode="same")
+
+
+def plot_density_chart(attempts, makes, surface="frequency", sigma=0, size=18, dpi=200, min_attempts=3):
+    """
+    Heatmap of binned shots over the half court.
+
+    `surface` is "frequency" (share of all attempts per bin) or "fg" (FG% per
+    bin, hidden below `min_attempts`). `sigma` > 0 applies Gaussian
+    smoothing (in bins) to attempts and makes before the ratio is taken.
+    """
+    attempts = attempts.astype(float)
+    makes = makes.astype(float)
+    if sigma > 0:
+        attempts, makes = smooth_grid(attempts, sigma), smooth_grid(makes, sigma)
+
+    total = attempts.sum()
+    if surface == "fg":
+        with np.errstate(invalid="ignore", divide="ignore"):
+            values = np.ma.masked_where(attempts < min_attempts, makes / attempts * 100)
+        cmap, vmin, vmax, label = "RdYlGn", 20, 70, "FG%"
+    else:
+        values = np.ma.masked_where(attempts <= 0.01, attempts / total * 100 if total else attempts)
+        cmap, vmin, vmax, label = "YlOrRd", 0, None, "% of attempts"
+
+    fig, ax = plt.subplots(figsize=(size, size), dpi=dpi)
+    image = ax.imshow(values.T, origin="lower", extent=COURT_EXTENT, aspect="auto", cmap=cmap,
+                      vmin=vmin, vmax=vmax, alpha=0.85, zorder=0,
+                      interpolation="bilinear" if sigma > 0 else "nearest")
+    draw_court_layer(ax)
+    ax.set_xlim(COURT_EXTENT[:2])
+    ax.set_ylim(COURT_EXTENT[2:])
+    ax.axis('off')
+
+    font_size = 20 * size / 18
+    colorbar = fig.colorbar(image, ax=ax, orientation="horizontal", fraction=0.04, pad=0.02)
+    colorbar.set_label(label, fontsize=font_size)
+    colorbar.ax.tick_params(labelsize=font_size * 0.8)
+    return fig
+
+
+SHOT_CATEGORIES = ("Layup", "Midrange", "3PT")
+
+
+def shot_category_summary(df: pd.DataFrame, categories=SHOT_CATEGORIES):
+    """
+    (makes, attempts, pct) for every shot category from one pass over the shots.
+
+    Makes and attempts are counted once per distinct SHOT_TYPE value; a
+    category then totals the SHOT_TYPE values that contain its name
+    (case-insensitive), so adding categories costs no extra row scans.
+    """
+    shot_types = df["SHOT_TYPE"]
+    if not isinstance(shot_types.dtype, pd.CategoricalDtype):
+        shot_types = shot_types.astype("category")
+    codes = shot_types.cat.codes.to_numpy()
+    valid = codes >= 0
+    n_types = len(shot_types.cat.categories)
+    made = np.nan_to_num(df["SHOT_MADE_FLAG"].to_numpy(dtype=float)[valid])
+    attempts_by_type = np.bincount(codes[valid], minlength=n_types)
+    makes_by_type = np.bincount(codes[valid], weights=made, minlength=n_types)
+
+    labels = shot_types.cat.categories.astype(str).str.lower()
+    summary = {}
+    for category in categories:
+        match = np.asarray(labels.str.contains(category.lower(), regex=False), dtype=bool)
+        makes = int(makes_by_type[match].sum())
+        attempts = int(attempts_by_type[match].sum())
+        pct = makes / attempts * 100 if attempts > 0 else 0
+        summary[category] = (makes, attempts, pct)
+    return summary
+
+
 def calc_zone_stats(df: pd.DataFrame, shot_type: str):
-    zone = df[df["SHOT_TYPE"].str.contains(shot_type, case=False, na=False)]
-    makes = int(zone["SHOT_MADE_FLAG"].sum())
-    attempts = int(zone.shape[0])
-    pct = makes / attempts * 100 if attempts > 0 else 0
-    return makes, attempts, pct
+    return shot_category_summary(df, (shot_type,))[shot_type]
 
 # def styled_text(text, size=22, weight="bold", margin="0px", underline=False, center=False, vertical=False):
 #     underline_css = "text-decoration: underline;" if underline else ""
@@ -356,5 +664,103 @@ def centered_metric(label, value, delta=None):
     """
     st.markdown(html, unsafe_allow_html=True)
 
+TABLE_CSS = """
+<style>
+.jp-table { width: 100%; border-collapse: collapse; color: #0033A0; text-align: center; }
+.jp-table caption { color: #0033A0; font-weight: bold; padding-bottom: 12px; }
+.jp-table th, .jp-table td { border: 1px solid #0033A0; padding: 8px 4px; }
+.jp-table th { background: #da1a32; font-weight: bold; border-width: 2.5px; }
+.jp-table tbody tr:nth-child(even) td { background: #BDBDBDB0; }
+.jp-table tbody tr.total td { background: black; color: white; font-weight: bold; border-width: 2.5px; }
+.jp-table tbody td.colored { color: black; }
+</style>
+"""
+
+
+def _escape_cells(values):
+    """HTML-escape a string Series; line breaks in labels become <br>."""
+    return (values.str.replace("&", "&amp;", regex=False).str.replace("<", "&lt;", regex=False)
+            .str.replace(">", "&gt;", regex=False).str.replace("\n", "<br>", regex=False))
+
+
+def format_table_values(frame, percent_cols=()):
+    """
+    Display text for every cell, one column at a time: whole numbers without
+    decimals, other numbers to two places (one place plus "%" for
+    `percent_cols`), missing values blank, text as is.
+    """
+    text = {}
+    for col in frame.columns:
+        values = frame[col]
+        numeric = pd.to_numeric(values, errors="coerce").round(1 if col in percent_cols else 2)
+        is_num = numeric.notna()
+        if values.dtype == object:  # mixed columns (e.g. 0 shown as ""): keep text cells as typed
+            is_num &= values.map(lambda v: not isinstance(v, str))
+        whole = is_num & (numeric % 1 == 0)
+        cells = values.astype(str).where(values.notna(), "")
+        cells = cells.mask(is_num, numeric.astype(str))
+        cells = cells.mask(whole, numeric.where(whole).astype("Int64").astype(str))
+        if col in percent_cols:
+            cells = cells.mask(is_num, cells + "%")
+        text[col] = _escape_cells(cells)
+    return pd.DataFrame(text, index=frame.index)
+
+
+def benchmark_colors(frame, benchmarks, good="#4CAF50", fair="#FFEB3B", poor="#F44336", zero="white"):
+    """
+    Background colour for every cell of `frame` from per-column benchmarks.
+
+    `benchmarks` maps column -> {"green": g, "yellow": y, "low_is_good": bool}.
+    A value at or past green is good, at or past yellow fair, otherwise
+    poor ("past" is below when low is good); zeros get `zero`. Columns
+    without a benchmark get "".
+    """
+    colors = pd.DataFrame("", index=frame.index, columns=frame.columns, dtype=object)
+    cols = [col for col in frame.columns if col in benchmarks]
+    if not cols:
+        return colors
+    values = frame[cols].to_numpy(dtype=float)
+    green = np.array([benchmarks[col]["green"] for col in cols], dtype=float)
+    yellow = np.array([benchmarks[col]["yellow"] for col in cols], dtype=float)
+    low = np.array([benchmarks[col].get("low_is_good", False) for col in cols])
+
+    # Flip low-is-good columns so "past" is always >=
+    sign = np.where(low, -1.0, 1.0)
+    scored = values * sign
+    colors[cols] = np.select(
+        [low & (values == 0), scored >= green * sign, scored >= yellow * sign, values == 0],
+        [zero, good, fair, zero],
+        default=poor,
+    )
+    return colors
+
+
+def table_html(frame, colors=None, total_row=True, title=None, font_size=20, percent_cols=()):
+    """
+    A stats table as styled HTML (red header, striped rows, black TOTAL row).
+
+    `total_row` styles the last row as the total. `colors` is an optional
+    array of CSS backgrounds shaped like `frame`; empty entries keep the
+    stripe colour. Numbers are formatted here (see format_table_values).
+    """
+    cells = format_table_values(frame, percent_cols).to_numpy(dtype=object)
+    opens = np.full(cells.shape, "<td>", dtype=object)
+    if colors is not None:
+        colors = np.asarray(colors, dtype=object)
+        colored = pd.notna(colors) & (colors != "")
+        opens[colored] = '<td class="colored" style="background:' + colors[colored].astype(str) + '">'
+    cells = opens + cells + "</td>"
+
+    row_opens = np.full(len(cells), "<tr>", dtype=object)
+    if total_row and len(cells):
+        row_opens[-1] = '<tr class="total">'
+    rows = "".join(row_open + "".join(row) + "</tr>" for row_open, row in zip(row_opens, cells))
+
+    header = "".join(f"<th>{label}</th>" for label in _escape_cells(pd.Series(frame.columns, dtype=str)))
+    caption = f"<caption style='font-size:{font_size * 1.5}px'>{_escape_cells(pd.Series([str(title)]))[0]}</caption>" if title else ""
+    return (f"{TABLE_CSS}<table class='jp-table' style='font-size:{font_size}px'>{caption}"
+            f"<thead><tr>{header}</tr></thead><tbody>{rows}</tbody></table>")
+
+
 def set_active_tab(tab_name):
     st.session_state.active_tab = tab_name
\ No newline at end of file
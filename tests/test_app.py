@@ -0,0 +1,30 @@
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+from fixturesapp import make_season, write_season
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def run_app(tmp_path, monkeypatch):
+    write_season(make_season(scale=1), tmp_path)
+    monkeypatch.setenv("JP_DATA_DIR", str(tmp_path))
+    monkeypatch.chdir(ROOT)  # the header images are read from photos/
+    app = AppTest.from_file(str(ROOT / "app.py"), default_timeout=120)
+    app.secrets["auth"] = {}
+    app.secrets["data"] = {}
+    app.session_state["auth"] = True
+    app.session_state["username"] = "Coach"
+    return app.run()
+
+
+def test_lunch_pail_with_no_hustle_rows(tmp_path, monkeypatch):
+    app = run_app(tmp_path, monkeypatch)
+    app.radio(key="active_tab").set_value("Lunch Pail Stats").run()
+    # Game 1 is played in week 1, so week 2 has no hustle rows for it
+    [game] = [box for box in app.selectbox if box.label == "Select Game/Practice"]
+    game.select("Game 1").run()
+    app.selectbox(key="lunch_pail_week").select("2").run()
+    assert not app.exception
+    assert "TOTAL" in "".join(block.value for block in app.markdown)
@@ -0,0 +1,180 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from dataapp import (BOX_COLUMNS, HUSTLE_COLUMNS, SCHEMAS, ViewCache, append_rows, box_metrics, build_index,
+                     compact_frame, count_matrix, efficiency_cube, efficiency_metrics, group_mask, parse_source,
+                     parse_tail, possession_counts, read_snapshot, select_rows, sum_by, weighted_scores,
+                     write_snapshot, zone_types)
+from fixturesapp import make_season
+
+HEAD = (b"Player,Week,GAME,TYPE,Ast,TO,OFF_Reb,DEF_Reb\n"
+        b"Clark Smith,1,Game 1,Game,2,1,0,3\n"
+        b"Abney Moss,1,Game 1,Game,1,0,1,2\n")
+TAIL = (b"Clark Smith,2,Game 2,Game,4,2,1,1\n"
+        b"Bennett Rooker,2,Game 2,Game,0,1,0,0\n")
+
+
+def test_compact_frame_totals_do_not_wrap():
+    frame = compact_frame(pd.DataFrame({"Player": ["A"] * 20 + ["B"] * 20, "OFF_Reb": 4, "DEF_Reb": 5}))
+    assert isinstance(frame["Player"].dtype, pd.CategoricalDtype)
+    totals = frame.groupby("Player", observed=True)[["OFF_Reb", "DEF_Reb"]].sum()
+    assert (totals["OFF_Reb"] + totals["DEF_Reb"]).tolist() == [180, 180]
+
+
+def test_append_after_restart_from_snapshot(tmp_path):
+    schema = SCHEMAS["game"]
+    url = "https://example.com/game.csv"
+    write_snapshot(url, "v1", parse_source(HEAD, schema), cache_dir=tmp_path)
+
+    # A restarted process gets the sheet back from its snapshot, then the sheet grows
+    restored = read_snapshot(url, "v1", cache_dir=tmp_path)
+    watermark = {"schema": schema, "size": len(HEAD), "digest": hashlib.sha256(HEAD).hexdigest()}
+    tail = parse_tail(HEAD + TAIL, watermark, schema)
+    game = append_rows(restored, tail, schema)
+
+    full = parse_source(HEAD + TAIL, schema)
+    assert game["Player"].tolist() == full["Player"].tolist()
+    assert game["Week"].cat.categories.tolist() == ["1", "2"]
+    assert game["Week"].cat.ordered
+    assert game["GAME"].tolist() == full["GAME"].tolist()
+    assert game["Ast"].sum() == 7
+
+
+def season_sheet(name):
+    """A synthetic sheet typed the way load_sources types the live one."""
+    frame = make_season(scale=1)[name]
+    return parse_source(frame.to_csv(index=False).encode(), SCHEMAS[name])
+
+
+def test_select_rows_matches_boolean_filter():
+    shots = season_sheet("shooting")
+    index = build_index(shots)
+    week, game, player = shots["WEEK"].iloc[0], shots["GAME"].iloc[0], shots["PLAYER"].iloc[0]
+    selections = [
+        {},
+        {"TYPE": ["Game", "Practice"], "WEEK": None},
+        {"WEEK": week, "PLAYER": player},
+        {"TYPE": ["Game", "Practice", "Pickup"], "WEEK": week, "GAME": game, "PLAYER": player},
+        {"PLAYER": "Nobody"},
+    ]
+    for criteria in selections:
+        expected = shots
+        for col, values in criteria.items():
+            if values is not None:
+                expected = expected[expected[col].isin(values if isinstance(values, list) else [values])]
+        pd.testing.assert_frame_equal(select_rows(shots, index, criteria), expected)
+
+    # A criterion on a column the sheet does not have selects nothing
+    assert select_rows(shots, index, {"Practice": game}).empty
+
+
+def test_count_matrix_selection_matches_groupby():
+    hustle = season_sheet("hustle")
+    hustle.loc[hustle.index[:3], "Week"] = None  # a row without a week still counts toward the season
+    groups, counts = count_matrix(hustle, ["Player", "Week", "Game/Practice"], HUSTLE_COLUMNS)
+    assert counts.dtype == np.int64
+    assert (counts.sum(axis=0) == hustle[HUSTLE_COLUMNS].sum().to_numpy()).all()
+
+    week = hustle["Week"].dropna().iloc[0]
+    for criteria, rows in [({"Week": None}, hustle), ({"Week": [week]}, hustle[hustle["Week"] == week]),
+                           ({"Week": "Nobody"}, hustle.iloc[0:0])]:
+        players, totals = sum_by(groups, counts, "Player", group_mask(groups, criteria))
+        expected = rows.groupby("Player", observed=True)[HUSTLE_COLUMNS].sum()
+        assert players == expected.index.tolist()
+        assert (totals == expected.to_numpy()).all()
+
+    # Columns without a weight score 0
+    scores = weighted_scores(counts, HUSTLE_COLUMNS, {"Charges": 3, "Blocks": 0.5})
+    assert np.allclose(scores, 3 * counts[:, HUSTLE_COLUMNS.index("Charges")]
+                       + 0.5 * counts[:, HUSTLE_COLUMNS.index("Blocks")])
+
+
+def test_box_metrics_per_player_and_team():
+    game = parse_source(HEAD + TAIL + b",2,Game 2,Game,1,0,0,2\n", SCHEMAS["game"])
+    groups, counts = count_matrix(game, ["Player", "Week", "GAME"], BOX_COLUMNS)
+    metrics = box_metrics(groups, counts, group_mask(groups, {"Week": "2"}))
+    assert metrics.index.tolist() == ["Bennett Rooker", "Clark Smith", "Team"]
+    assert metrics.loc["Clark Smith", BOX_COLUMNS].tolist() == [4, 2, 1, 1]
+    assert metrics.loc["Clark Smith", "AST/TO"] == 2
+    assert metrics.loc["Bennett Rooker", "AST/TO"] == 0
+    # The team row also counts the row with no player
+    assert metrics.loc["Team", BOX_COLUMNS].tolist() == [5, 3, 1, 3]
+    assert metrics.loc["Team", "AST/TO"] == 1.67
+    assert np.isnan(box_metrics(groups, counts, group_mask(groups, {"Player": "Abney Moss"})).loc["Team", "AST/TO"])
+
+
+def test_view_cache_evicts_least_recently_used():
+    cache = ViewCache(maxsize=2)
+    calls = []
+
+    def view(key):
+        def compute():
+            calls.append(key)
+            return key.upper()
+        return cache.get(key, compute)
+
+    assert [view("a"), view("b"), view("a")] == ["A", "B", "A"]
+    view("c")  # evicts "b", the least recently used
+    assert view("a") == "A"
+    view("b")
+    assert calls == ["a", "b", "c", "b"]
+    assert cache.stats() == {"hits": 2, "misses": 4, "size": 2, "weight": 2}
+
+
+def test_view_cache_bounds_total_weight():
+    cache = ViewCache(maxsize=10, weigh=len)
+    for key, image in [("a", b"1234"), ("b", b"12345"), ("c", b"123")]:
+        cache.get(key, lambda: image)
+    # "a" is evicted once the images add up to more than 10 bytes
+    assert cache.stats() == {"hits": 0, "misses": 3, "size": 2, "weight": 8}
+    # A value heavier than the bound is still kept on its own
+    cache.get("d", lambda: b"x" * 20)
+    assert cache.stats()["size"] == 1
+    assert cache.get("d", lambda: b"") == b"x" * 20
+
+
+def test_zone_types_without_zones():
+    types = zone_types(pd.Series([None, None], dtype="category"))
+    assert isinstance(types.dtype, pd.CategoricalDtype)
+    assert types.isna().all()
+
+
+def test_possession_free_throws_from_columns_only():
+    log = pd.DataFrame({"Team O/D": ["O", "O", "D", "O"], "Result": ["FT", "2PT Make", "FT", "FT"],
+                        "Points Scored": [3, 3, 0, 2], "Points Allowed": [0, 0, 2, 0],
+                        "FTA": [3, 1, 2, 1], "FTM": [3, 1, 2, 2]})
+    counts = possession_counts(log)
+    assert counts["FTA"].tolist() == [3, 1, 0, 1]
+    assert counts["FTM"].tolist() == [3, 1, 0, 1]  # makes capped at attempts, defense not counted
+    assert counts["2PM"].tolist() == [0, 1, 0, 0]
+
+    without = possession_counts(log.drop(columns=["FTA", "FTM"]))
+    assert without[["FTA", "FTM"]].to_numpy().sum() == 0
+
+
+def test_efficiency_metrics_per_player_on_court():
+    log = pd.DataFrame({
+        "Week": ["1", "1", "1", "2"], "Game": ["Game 1", "Game 1", "Game 1", "Game 2"],
+        "Team O/D": ["O", "D", "O", "O"],
+        "Lineup": ["A, B", "A, B", "B, C", "A, C"],
+        "Result": ["3PT Make", "2PT Make", "2PT Miss", "2PT Make"],
+        "Points Scored": [3, 0, 0, 2], "Points Allowed": [0, 2, 0, 0],
+    })
+    groups, counts = efficiency_cube(log)
+    metrics = efficiency_metrics(groups, counts)
+    assert metrics.index.tolist() == ["A", "B", "C", "Team"]
+    # A was on court for possessions 1, 2 and 4
+    assert metrics.loc["A", ["OFF Poss", "DEF Poss", "Points Scored", "Games"]].tolist() == [2, 1, 5, 2]
+    assert metrics.loc["A", "OFF Rtg"] == 250
+    assert metrics.loc["A", "DEF Rtg"] == 200
+    assert metrics.loc["A", "eFG%"] == 125
+    assert metrics.loc["Team", "Points Scored"] == 5
+    assert metrics.loc["Team", "2PT%"] == 50
+    assert np.isnan(metrics.loc["C", "DEF Rtg"])  # never on court on defense
+    assert np.isnan(metrics.loc["Team", "FT%"])   # the log has no FTA/FTM columns
+
+    week_two = efficiency_metrics(groups, counts, group_mask(groups, {"Week": "2"}))
+    assert week_two.loc["C", ["Points Scored", "Games"]].tolist() == [2, 1]
+    assert "B" not in week_two.index
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+from matplotlib.path import Path
+
+from dataapp import group_mask
+from functionsapp import (ARC_CX, ARC_CY, ARC_R, COURT_EXTENT, DENSITY_BINS, ZONE_COORDS, ZONE_NAMES,
+                          benchmark_colors, classify_zones, shot_bin_cube, table_html, zone_chart_key)
+
+
+def test_classify_zones_agrees_with_zone_outlines():
+    rng = np.random.default_rng(0)
+    court = np.column_stack([rng.uniform(-250, 250, 200_000), rng.uniform(-47.5, 355, 200_000)])
+    # Points within a hair of the 3PT arc, where the straight outline edges and the circle differ
+    angle = np.radians(rng.uniform(0, 180, 200_000))
+    radius = ARC_R + rng.uniform(-0.1, 0.1, 200_000)
+    arc = np.column_stack([ARC_CX + radius * np.cos(angle), ARC_CY + radius * np.sin(angle)])
+    points = np.concatenate([court, arc])
+
+    labels = classify_zones(points[:, 0], points[:, 1])
+    inside = np.array([Path(coords).contains_points(points) for coords in ZONE_COORDS.values()])
+    assert inside.any(axis=1).all()  # every outline gets sampled
+
+    # A point inside an outline is labelled with it (or with the other outline, in the
+    # slivers where two outlines drawn along the arc overlap)
+    covered = np.flatnonzero(inside.any(axis=0))
+    codes = np.array([ZONE_NAMES.index(label) for label in labels[covered]])
+    assert inside[codes, covered].all()
+
+
+def test_zone_chart_key_follows_chart_content():
+    stats = pd.DataFrame({"ZONE": ["Left Layup", "Top of Key 3"], "makes": [3, 1], "attempts": [5, 4]})
+    key = zone_chart_key(stats, size=18, dpi=200)
+    assert zone_chart_key(stats.copy(), size=18, dpi=200) == key
+    assert zone_chart_key(stats.assign(makes=[3, 2]), size=18, dpi=200) != key
+    assert zone_chart_key(stats, size=18, dpi=100) != key
+
+
+def test_shot_bin_cube_matches_histogram_per_selection():
+    rng = np.random.default_rng(1)
+    n = 2_000
+    shots = pd.DataFrame({
+        "PLAYER": rng.choice(["A", "B", None], n),
+        "WEEK": rng.choice(["1", "2"], n),
+        "TYPE": "Game",
+        "GAME": rng.choice(["G1", "G2"], n),
+        "LOC_X": rng.uniform(-260, 260, n),
+        "LOC_Y": rng.uniform(-50, 430, n),
+        "SHOT_MADE_FLAG": rng.integers(0, 2, n),
+    })
+    groups, attempts, makes = shot_bin_cube(shots)
+    x0, x1, y0, y1 = COURT_EXTENT
+
+    def histogram(rows):
+        return np.histogram2d(rows["LOC_X"], rows["LOC_Y"], bins=DENSITY_BINS, range=[[x0, x1], [y0, y1]])[0]
+
+    # Shots with a blank PLAYER keep their own group
+    assert attempts.sum() == histogram(shots).sum()
+    mask = group_mask(groups, {"PLAYER": "A", "WEEK": ["2"], "GAME": None})
+    picked, picked_makes = attempts[mask].sum(axis=0), makes[mask].sum(axis=0)
+    rows = shots[(shots["PLAYER"] == "A") & (shots["WEEK"] == "2")]
+    assert np.array_equal(picked, histogram(rows))
+    assert np.array_equal(picked_makes, histogram(rows[rows["SHOT_MADE_FLAG"] == 1]))
+
+
+def test_table_html_formats_and_escapes_cells():
+    frame = pd.DataFrame({"Player": ["A <b>", "TOTAL"], "PTS": [12.0, 20.0], "FG%": [41.666, None]})
+    html = table_html(frame, colors=[["", "", "#ff0000"], ["", "", ""]], title="Week <1>")
+    assert "<caption style='font-size:30.0px'>Week &lt;1&gt;</caption>" in html
+    assert "<td>A &lt;b&gt;</td><td>12</td><td class=\"colored\" style=\"background:#ff0000\">41.67</td>" in html
+    assert '<tr class="total"><td>TOTAL</td><td>20</td><td></td></tr>' in html
+
+
+def test_benchmark_colors_per_column_direction():
+    frame = pd.DataFrame({"Player": ["A", "B", "C", "D"], "Deflect%": [60.0, 45.0, 10.0, 0.0],
+                          "Foul%": [5.0, 15.0, 30.0, 0.0]})
+    benchmarks = {"Deflect%": {"green": 50, "yellow": 40},
+                  "Foul%": {"green": 10, "yellow": 20, "low_is_good": True}}
+    colors = benchmark_colors(frame, benchmarks, good="g", fair="y", poor="r", zero="w")
+    assert colors["Player"].tolist() == ["", "", "", ""]
+    assert colors["Deflect%"].tolist() == ["g", "y", "r", "w"]
+    assert colors["Foul%"].tolist() == ["g", "y", "r", "w"]